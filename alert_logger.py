@@ -4,11 +4,32 @@ Logs crime detection events with images and metadata to organized folders
 """
 
 import os
+import csv
+import heapq
 import json
+import atexit
+import queue
+import threading
+import time
 import cv2
+from collections import defaultdict
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set
+
+
+# Daily logs are append-only JSON Lines; *_alerts.json arrays are the pre-JSONL format
+DAILY_LOG_SUFFIX = "_alerts.jsonl"
+LEGACY_DAILY_LOG_SUFFIX = "_alerts.json"
+
+# Daily log entry keys (CSV export columns)
+DAILY_LOG_FIELDS = [
+    "alert_id", "timestamp", "datetime_readable", "alert_type",
+    "threat_score", "confidence", "image_file", "metadata_file",
+]
+
+# Held while a daily log is appended to or rewritten, so a compaction can't drop an append
+_daily_log_lock = threading.Lock()
 
 
 class NumpyEncoder(json.JSONEncoder):
@@ -23,16 +44,382 @@ class NumpyEncoder(json.JSONEncoder):
         return super().default(obj)
 
 
+class AlertWriteJob:
+    """Everything needed to persist one alert, prepared by the caller of log_alert."""
+
+    __slots__ = ("frame", "image_path", "metadata", "metadata_path", "daily_log_file", "daily_entry",
+                 "log_info", "on_written", "image_saved")
+
+    def __init__(self, frame, image_path: Optional[Path], metadata: Dict, metadata_path: Path,
+                 daily_log_file: Path, daily_entry: Dict, log_info: Optional[Dict] = None,
+                 on_written: Optional[Callable[[Dict], None]] = None):
+        self.frame = frame  # None when the image is skipped
+        self.image_path = image_path
+        self.metadata = metadata
+        self.metadata_path = metadata_path
+        self.daily_log_file = daily_log_file
+        self.daily_entry = daily_entry
+        self.log_info = log_info if log_info is not None else {}
+        self.on_written = on_written  # Called with log_info once the alert is on disk
+        self.image_saved = False
+
+
+def _write_file(path: Path, data: bytes, open_fds: Optional[List[int]]) -> None:
+    """Write a file; with open_fds the descriptor is left open for a grouped fsync."""
+    fd = os.open(str(path), os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    except Exception:
+        os.close(fd)
+        raise
+    if open_fds is None:
+        os.close(fd)
+    else:
+        open_fds.append(fd)
+
+
+def _fsync_dir(path: Path) -> None:
+    """Persist new directory entries (not supported on every platform)."""
+    try:
+        fd = os.open(str(path), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _append_daily_log(daily_log_file: Path, entries: List[Dict], fsync: bool = False) -> None:
+    """Append entries to a day's JSON Lines log, one line each (the file is never rewritten)."""
+    lines = "".join(json.dumps(entry, cls=NumpyEncoder) + "\n" for entry in entries).encode("utf-8")
+    try:
+        with _daily_log_lock, open(daily_log_file, 'a+b') as f:
+            # A crash mid-append leaves a torn last line; start on a fresh line so only it is lost
+            if f.tell() > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    lines = b"\n" + lines
+            f.write(lines)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+    except Exception as e:
+        print(f"⚠️ Error writing daily log: {str(e)}")
+
+
+def iter_daily_log(daily_log_file: Path) -> Iterator[Dict]:
+    """Stream the entries of a JSON Lines daily log (blank and torn lines are skipped)."""
+    with open(daily_log_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def _write_daily_log(daily_log_file: Path, entries: List[Dict]) -> None:
+    """Replace a daily log with the given entries (temp file + fsync + atomic rename)."""
+    temp_log_file = daily_log_file.with_suffix('.tmp')
+    try:
+        with open(temp_log_file, 'w', encoding='utf-8') as f:
+            for entry in entries:
+                f.write(json.dumps(entry, cls=NumpyEncoder) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        temp_log_file.replace(daily_log_file)
+    except Exception:
+        if temp_log_file.exists():
+            temp_log_file.unlink()
+        raise
+
+
+def _dedupe_sorted(entries: Iterable[Dict]) -> List[Dict]:
+    """One entry per alert_id (last one wins), in timestamp order."""
+    by_id: Dict[str, Dict] = {}
+    for entry in entries:
+        by_id[str(entry.get('alert_id'))] = entry
+    return sorted(by_id.values(), key=lambda a: a.get('timestamp', ''))
+
+
+def compact_daily_log(daily_log_file: Path) -> int:
+    """
+    Rewrite a finished day's log without torn lines or duplicates, sorted by timestamp.
+    
+    Safe to call from any thread: appends wait until the rewritten file is in place.
+    
+    Returns:
+        Number of entries kept
+    """
+    with _daily_log_lock:
+        entries = _dedupe_sorted(iter_daily_log(daily_log_file))
+        _write_daily_log(daily_log_file, entries)
+    return len(entries)
+
+
+def migrate_daily_logs(daily_logs_dir: Path) -> int:
+    """
+    Convert legacy YYYYMMDD_alerts.json arrays to JSON Lines logs.
+    
+    Entries are merged with any JSON Lines log already written for that day; the old file is
+    kept as *.json.migrated. Unreadable files are left in place.
+    
+    Returns:
+        Number of files migrated
+    """
+    migrated = 0
+    for legacy_file in sorted(daily_logs_dir.glob(f"*{LEGACY_DAILY_LOG_SUFFIX}")):
+        try:
+            with open(legacy_file, 'r') as f:
+                legacy_entries = json.load(f)
+            if not isinstance(legacy_entries, list):
+                raise ValueError("expected a JSON array")
+        except (json.JSONDecodeError, ValueError) as e:
+            print(f"⚠️ Skipping daily log migration for {legacy_file.name}: {e}")
+            continue
+
+        date_str = legacy_file.name[:-len(LEGACY_DAILY_LOG_SUFFIX)]
+        daily_log_file = daily_logs_dir / f"{date_str}{DAILY_LOG_SUFFIX}"
+        entries = list(legacy_entries)
+        with _daily_log_lock:
+            if daily_log_file.exists():
+                entries.extend(iter_daily_log(daily_log_file))
+            _write_daily_log(daily_log_file, _dedupe_sorted(entries))
+        legacy_file.replace(legacy_file.with_name(legacy_file.name + ".migrated"))
+        migrated += 1
+
+    if migrated:
+        print(f"📦 Migrated {migrated} daily log(s) to JSON Lines")
+    return migrated
+
+
+def write_alert_batch(jobs: List[AlertWriteJob], fsync: bool = False) -> None:
+    """
+    Persist a batch of alerts: images and metadata first, then one daily log update per day.
+    
+    With fsync, all image/metadata files are synced together before the entries that
+    reference them are appended to the daily log, and each directory is synced once per batch.
+    """
+    open_fds: Optional[List[int]] = [] if fsync else None
+    dirs = set()
+    try:
+        for job in jobs:
+            if job.frame is not None and job.image_path is not None:
+                ok, buffer = cv2.imencode(".jpg", job.frame)
+                if ok:
+                    _write_file(job.image_path, buffer.tobytes(), open_fds)
+                    dirs.add(job.image_path.parent)
+                    job.image_saved = True
+                else:
+                    print(f"⚠️ Could not encode alert image: {job.image_path}")
+            payload = json.dumps(job.metadata, indent=2, cls=NumpyEncoder).encode("utf-8")
+            _write_file(job.metadata_path, payload, open_fds)
+            dirs.add(job.metadata_path.parent)
+    finally:
+        sync_error = None
+        for fd in open_fds or []:
+            try:
+                os.fsync(fd)
+            except OSError as e:
+                sync_error = sync_error or e
+            finally:
+                os.close(fd)
+        if sync_error:
+            raise sync_error
+
+    entries_by_log: Dict[Path, List[Dict]] = defaultdict(list)
+    for job in jobs:
+        entries_by_log[job.daily_log_file].append(job.daily_entry)
+    for daily_log_file, entries in entries_by_log.items():
+        _append_daily_log(daily_log_file, entries, fsync=fsync)
+        dirs.add(daily_log_file.parent)
+
+    if fsync:
+        for directory in dirs:
+            _fsync_dir(directory)
+
+
+def _complete_jobs(jobs: List[AlertWriteJob]) -> None:
+    """Report written alerts to their callers (after the whole batch, fsync included, succeeded)."""
+    for job in jobs:
+        job.log_info["status"] = "success"
+        job.log_info["image_saved"] = job.image_saved
+        if job.on_written is None:
+            continue
+        try:
+            job.on_written(job.log_info)
+        except Exception as e:
+            print(f"⚠️ Alert completion callback failed: {str(e)}")
+
+
+class AlertWriter:
+    """
+    Dedicated thread that persists alerts off the detection loop.
+    
+    Alerts go into a bounded queue (a full queue drops the new alert and counts it rather
+    than stalling detection); the thread takes everything queued, up to max_batch, and writes
+    it as one batch, so bursts cost one daily log append and one fsync pass per batch.
+    Once alerts for a later day arrive, the day logs it appended to before are compacted.
+    """
+
+    def __init__(self, max_queue: int = 256, max_batch: int = 32, fsync: bool = True):
+        """
+        Args:
+            max_queue: Alerts waiting to be written before new ones are dropped
+            max_batch: Most alerts written (and fsynced) together
+            fsync: Sync files and directories after each batch
+        """
+        self.max_batch = max_batch
+        self.fsync = fsync
+        self._queue: "queue.Queue[Optional[AlertWriteJob]]" = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._closed = False
+        self._open_logs: Set[Path] = set()  # Daily logs appended to since their last compaction
+
+        # Statistics
+        self.queued = 0
+        self.written = 0
+        self.dropped = 0
+        self.errors = 0
+        self.batches = 0
+        self.max_queue_depth = 0
+        self.last_batch_ms = 0.0
+        self.write_seconds = 0.0
+        self.compactions = 0
+
+        self._thread = threading.Thread(target=self._run, daemon=True, name="alert-writer")
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, job: AlertWriteJob) -> bool:
+        """Queue an alert without blocking. Returns False (and counts a drop) when the queue is full."""
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+        with self._lock:
+            self.queued += 1
+            self.max_queue_depth = max(self.max_queue_depth, self._queue.qsize())
+        return True
+
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            job = self._queue.get()
+            batch: List[AlertWriteJob] = []
+            taken = 1
+            if job is None:
+                stop = True
+            else:
+                batch.append(job)
+            while not stop and len(batch) < self.max_batch:
+                try:
+                    job = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                taken += 1
+                if job is None:
+                    stop = True
+                else:
+                    batch.append(job)
+
+            if batch:
+                start = time.perf_counter()
+                try:
+                    write_alert_batch(batch, fsync=self.fsync)
+                    failed = 0
+                    _complete_jobs(batch)
+                except Exception as e:
+                    print(f"❌ Error writing alert batch: {str(e)}")
+                    failed = len(batch)
+                self._compact_finished_days(batch)
+                elapsed = time.perf_counter() - start
+                with self._lock:
+                    self.batches += 1
+                    self.written += len(batch) - failed
+                    self.errors += failed
+                    self.last_batch_ms = elapsed * 1000
+                    self.write_seconds += elapsed
+            for _ in range(taken):
+                self._queue.task_done()
+
+    def _compact_finished_days(self, batch: List[AlertWriteJob]) -> None:
+        """Compact the logs of earlier days once alerts for a later day are being written."""
+        self._open_logs.update(job.daily_log_file for job in batch)
+        newest = max(path.name for path in self._open_logs)
+        for daily_log_file in [path for path in self._open_logs if path.name < newest]:
+            self._open_logs.discard(daily_log_file)
+            try:
+                kept = compact_daily_log(daily_log_file)
+                print(f"🗜️ Compacted {daily_log_file.name}: {kept} alerts")
+            except Exception as e:
+                print(f"⚠️ Error compacting {daily_log_file.name}: {str(e)}")
+                continue
+            with self._lock:
+                self.compactions += 1
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until everything queued so far is written. Returns False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Write what is queued and stop the thread (also runs at interpreter exit)."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            print("⚠️ Alert writer did not drain before shutdown")
+            return
+        self._thread.join(timeout=timeout)
+
+    def get_stats(self) -> Dict:
+        """Get writer statistics (queue depth, drops, batching)."""
+        with self._lock:
+            return {
+                'queue_depth': self._queue.qsize(),
+                'max_queue_depth': self.max_queue_depth,
+                'queue_capacity': self._queue.maxsize,
+                'queued': self.queued,
+                'written': self.written,
+                'dropped': self.dropped,
+                'errors': self.errors,
+                'batches': self.batches,
+                'avg_batch_size': round(self.written / self.batches, 2) if self.batches else 0.0,
+                'last_batch_ms': round(self.last_batch_ms, 2),
+                'write_ms_per_alert': round(self.write_seconds * 1000 / self.written, 2) if self.written else None,
+                'compactions': self.compactions,
+            }
+
+
 class AlertLogger:
     """Logs crime detection alerts with images and JSON metadata."""
     
-    def __init__(self, alert_dir: str = "alerts", interval_seconds: int = 0):
+    def __init__(self, alert_dir: str = "alerts", interval_seconds: int = 0,
+                 writer: Optional[AlertWriter] = None):
         """
         Initialize alert logger.
         
         Args:
             alert_dir: Base directory for storing alerts (default: "alerts")
             interval_seconds: Minimum seconds between alert images (default: 0 = always save)
+            writer: Background writer to persist alerts on (default: write in log_alert)
         """
         self.base_dir = Path(alert_dir)
         self.base_dir.mkdir(exist_ok=True)
@@ -46,20 +433,32 @@ class AlertLogger:
         self.metadata_dir.mkdir(exist_ok=True)
         self.daily_logs_dir.mkdir(exist_ok=True)
         
+        # Convert daily logs from the old JSON-array format (no-op once done). With a shared
+        # writer this is done once by whoever starts it, not by every logger.
+        if writer is None:
+            migrate_daily_logs(self.daily_logs_dir)
+        
         # Interval tracking for continuous detection
         self.last_alert_time = 0
         self.interval_seconds = interval_seconds
+        self.writer = writer
         
         print(f"✅ Alert logger initialized at: {self.base_dir.absolute()}")
     
-    def log_alert(self, frame, detection_results: Dict, alert_type: str = "CRIME") -> Optional[Dict]:
+    def log_alert(self, frame, detection_results: Dict, alert_type: str = "CRIME",
+                  on_written: Optional[Callable[[Dict], None]] = None) -> Optional[Dict]:
         """
         Log a crime detection alert with image and metadata.
         
+        With a writer the files are written on its thread and this returns once the alert is
+        queued ("status": "queued"); the frame must not be modified afterwards. on_written runs
+        only after the files are on disk, so anything announcing the alert belongs there.
+        
         Args:
             frame: OpenCV image (BGR format)
             detection_results: Dict with detection results from cctv_detector.detect_frame()
             alert_type: Type of alert ("CRIME", "WEAPON", "MOTION", "CLUSTER")
+            on_written: Called with the final log info once the alert is written (writer thread)
             
         Returns:
             Dict with log information or None if logging failed
@@ -80,13 +479,12 @@ class AlertLogger:
             # Create alert ID
             alert_id = f"{alert_type}_{timestamp_str}"
             
-            # 1. Save Image (only if interval elapsed)
+            # 1. Image path (only if interval elapsed)
             image_filename = None
             image_path = None
             if should_save_image:
                 image_filename = f"{alert_id}.jpg"
                 image_path = self.images_dir / image_filename
-                cv2.imwrite(str(image_path), frame)
             
             # 2. Create Metadata JSON
             metadata = {
@@ -109,7 +507,8 @@ class AlertLogger:
                     {
                         "confidence": float(w.get('confidence', 0)),
                         "class": w.get('class', 'weapon'),
-                        "box": w.get('box', [])
+                        "box": w.get('box', []),
+                        "track_id": w.get('track_id')
                     }
                     for w in detection_results.get('weapons', [])
                 ],
@@ -117,27 +516,11 @@ class AlertLogger:
                 "image_path": str(image_path) if image_path else None
             }
             
-            # 3. Save Metadata JSON
             metadata_filename = f"{alert_id}.json"
             metadata_path = self.metadata_dir / metadata_filename
+            daily_log_file = self.daily_logs_dir / f"{timestamp.strftime('%Y%m%d')}{DAILY_LOG_SUFFIX}"
             
-            with open(metadata_path, 'w') as f:
-                json.dump(metadata, f, indent=2, cls=NumpyEncoder)
-            
-            # 4. Update Daily Log
-            daily_log_file = self.daily_logs_dir / f"{timestamp.strftime('%Y%m%d')}_alerts.json"
-            
-            daily_alerts = []
-            if daily_log_file.exists():
-                try:
-                    with open(daily_log_file, 'r') as f:
-                        daily_alerts = json.load(f)
-                except json.JSONDecodeError:
-                    # If corrupted, start fresh
-                    daily_alerts = []
-                    print(f"⚠️ Corrupted daily log, resetting...")
-            
-            # Add entry to daily log (without image data for file size)
+            # Daily log entry (without image data for file size)
             daily_entry = {
                 "alert_id": alert_id,
                 "timestamp": timestamp.isoformat(),
@@ -148,23 +531,9 @@ class AlertLogger:
                 "image_file": image_filename,
                 "metadata_file": metadata_filename
             }
-            daily_alerts.append(daily_entry)
-            
-            # Write to temporary file first, then rename (atomic operation)
-            temp_log_file = daily_log_file.with_suffix('.tmp')
-            try:
-                with open(temp_log_file, 'w') as f:
-                    json.dump(daily_alerts, f, indent=2, cls=NumpyEncoder)
-                # Atomic rename
-                temp_log_file.replace(daily_log_file)
-            except Exception as e:
-                print(f"⚠️ Error writing daily log: {str(e)}")
-                if temp_log_file.exists():
-                    temp_log_file.unlink()
             
-            # 5. Return log info
             log_info = {
-                "status": "success",
+                "status": "queued",
                 "alert_id": alert_id,
                 "timestamp": timestamp.isoformat(),
                 "image_saved": should_save_image,
@@ -173,7 +542,22 @@ class AlertLogger:
                 "daily_log": str(daily_log_file)
             }
             
-            # Print status based on whether image was saved
+            # 3. Write image, metadata and daily log (now, or on the writer thread)
+            job = AlertWriteJob(
+                frame if should_save_image else None, image_path,
+                metadata, metadata_path, daily_log_file, daily_entry,
+                log_info=dict(log_info), on_written=on_written,
+            )
+            if self.writer is not None:
+                if not self.writer.submit(job):
+                    print(f"⚠️ Alert writer queue full, dropped: {alert_id}")
+                    return {**log_info, "status": "dropped", "image_saved": False, "image_path": None}
+            else:
+                write_alert_batch([job])
+                _complete_jobs([job])
+                log_info = job.log_info
+            
+            # 4. Print status based on whether image was saved
             if should_save_image:
                 print(f"📸 Alert logged: {alert_id}")
                 print(f"   Image: {image_path}")
@@ -200,7 +584,7 @@ class AlertLogger:
         if date_str is None:
             date_str = datetime.now().strftime("%Y%m%d")
         
-        daily_log_file = self.daily_logs_dir / f"{date_str}_alerts.json"
+        daily_log_file = self.daily_logs_dir / f"{date_str}{DAILY_LOG_SUFFIX}"
         
         if not daily_log_file.exists():
             return {
@@ -209,13 +593,17 @@ class AlertLogger:
                 "alerts": []
             }
         
-        with open(daily_log_file, 'r') as f:
-            alerts = json.load(f)
-        
-        # Calculate statistics
+        # Statistics in the same pass that reads the log
+        alerts = []
+        crime_alerts = 0
+        threat_total = 0.0
+        for alert in iter_daily_log(daily_log_file):
+            alerts.append(alert)
+            if alert.get('alert_type') == 'CRIME':
+                crime_alerts += 1
+            threat_total += alert.get('threat_score', 0)
         total_alerts = len(alerts)
-        crime_alerts = sum(1 for a in alerts if a.get('alert_type') == 'CRIME')
-        avg_threat = sum(a.get('threat_score', 0) for a in alerts) / max(1, total_alerts)
+        avg_threat = threat_total / max(1, total_alerts)
         
         return {
             "date": date_str,
@@ -229,19 +617,21 @@ class AlertLogger:
         """
         Get all recent alerts.
         
+        Daily logs are read newest day first, keeping at most `limit` entries in memory, and
+        older days are not opened once `limit` alerts have been found.
+        
         Args:
             limit: Maximum number of alerts to return
             
         Returns:
             List of alerts sorted by timestamp (most recent first)
         """
-        all_alerts = []
+        all_alerts: List[Dict] = []
         
-        # Read all daily logs
-        for daily_log in sorted(self.daily_logs_dir.glob("*.json"), reverse=True):
-            with open(daily_log, 'r') as f:
-                alerts = json.load(f)
-                all_alerts.extend(alerts)
+        for daily_log in sorted(self.daily_logs_dir.glob(f"*{DAILY_LOG_SUFFIX}"), reverse=True):
+            all_alerts.extend(heapq.nlargest(limit, iter_daily_log(daily_log), key=lambda x: x['timestamp']))
+            if len(all_alerts) >= limit:
+                break  # Every older day only has older alerts
         
         # Sort by timestamp (most recent first)
         all_alerts.sort(key=lambda x: x['timestamp'], reverse=True)
@@ -265,7 +655,7 @@ class AlertLogger:
     
     def export_alerts_csv(self, output_file: str = "alerts_export.csv") -> bool:
         """
-        Export all alerts to CSV file.
+        Export all alerts to CSV file, oldest first, streaming one daily log at a time.
         
         Args:
             output_file: Output CSV filename
@@ -274,26 +664,54 @@ class AlertLogger:
             True if successful
         """
         try:
-            import csv
-            
-            all_alerts = self.get_all_alerts(limit=10000)
+            exported = 0
+            with open(output_file, 'w', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=DAILY_LOG_FIELDS, extrasaction='ignore')
+                writer.writeheader()
+                for daily_log in sorted(self.daily_logs_dir.glob(f"*{DAILY_LOG_SUFFIX}")):
+                    for alert in iter_daily_log(daily_log):
+                        writer.writerow(alert)
+                        exported += 1
             
-            if not all_alerts:
+            if not exported:
+                os.remove(output_file)
                 print("No alerts to export")
                 return False
             
-            with open(output_file, 'w', newline='') as f:
-                writer = csv.DictWriter(f, fieldnames=all_alerts[0].keys())
-                writer.writeheader()
-                writer.writerows(all_alerts)
-            
-            print(f"✅ Exported {len(all_alerts)} alerts to {output_file}")
+            print(f"✅ Exported {exported} alerts to {output_file}")
             return True
             
         except Exception as e:
             print(f"❌ Error exporting CSV: {str(e)}")
             return False
     
+    def compact_daily_logs(self, before_date: Optional[str] = None) -> int:
+        """
+        Compact every daily log older than a date (drops torn lines and duplicates, sorts).
+        
+        The background writer does this on its own when a day rolls over; this covers logs
+        written by a logger without a writer, or by a process that has since stopped.
+        
+        Args:
+            before_date: Date string in format "YYYYMMDD" (default: today)
+            
+        Returns:
+            Number of daily logs compacted
+        """
+        if before_date is None:
+            before_date = datetime.now().strftime("%Y%m%d")
+        
+        compacted = 0
+        for daily_log in sorted(self.daily_logs_dir.glob(f"*{DAILY_LOG_SUFFIX}")):
+            if daily_log.name[:len(before_date)] >= before_date:
+                continue
+            try:
+                compact_daily_log(daily_log)
+                compacted += 1
+            except Exception as e:
+                print(f"⚠️ Error compacting {daily_log.name}: {str(e)}")
+        return compacted
+    
     def cleanup_old_alerts(self, days: int = 30) -> int:
         """
         Delete alerts older than specified days.
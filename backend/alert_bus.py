@@ -0,0 +1,138 @@
+"""In-process fan-out of live alert events: one ring buffer, a cursor per subscriber."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import deque
+from itertools import islice
+from typing import Any, Deque, Dict, List, Optional
+
+from backend.change_notifier import ChangeNotifier
+
+ALERT_BUS_CAPACITY = 1000
+
+
+class AlertEvent:
+    """One published alert with its bus-wide id (ids are contiguous and start at 1)."""
+
+    __slots__ = ("id", "camera_id", "alert", "timestamp")
+
+    def __init__(self, event_id: int, camera_id: Optional[str], alert: Dict[str, Any], timestamp: float):
+        self.id = event_id
+        self.camera_id = camera_id
+        self.alert = alert
+        self.timestamp = timestamp
+
+
+class AlertRead:
+    """Result of reading the bus from a cursor."""
+
+    __slots__ = ("events", "cursor", "missed")
+
+    def __init__(self, events: List[AlertEvent], cursor: int, missed: int):
+        self.events = events
+        self.cursor = cursor  # Pass back as after_id on the next read
+        self.missed = missed  # Events that left the ring before this reader got to them
+
+
+class AlertBus:
+    """
+    Every subscriber sees every alert: publishing appends to a bounded ring buffer and wakes
+    waiters, and each reader keeps only an integer cursor (the last event id it has seen).
+
+    Nothing is drained, so adding readers costs no memory per alert; a reader that falls more
+    than `capacity` events behind skips ahead and is told how many it missed.
+    """
+
+    def __init__(self, capacity: int = ALERT_BUS_CAPACITY):
+        """
+        Args:
+            capacity: Events kept for readers that are behind (and for Last-Event-ID resume)
+
+        Raises:
+            ValueError: If capacity is less than 1
+        """
+        if capacity < 1:
+            raise ValueError(f"Alert bus capacity must be at least 1, got {capacity}")
+        self.capacity = capacity
+        self._events: Deque[AlertEvent] = deque(maxlen=capacity)
+        self.last_id = 0
+        self._lock = threading.Lock()
+        self._notifier = ChangeNotifier()
+
+        # Statistics
+        self.published = 0
+
+    def publish(self, alert: Dict[str, Any], camera_id: Optional[str] = None) -> int:
+        """
+        Append an alert and wake every waiting reader (callable from any thread).
+
+        Returns:
+            The event id
+        """
+        with self._lock:
+            self.last_id += 1
+            self.published += 1
+            self._events.append(AlertEvent(self.last_id, camera_id, alert, time.time()))
+            event_id = self.last_id
+        self._notifier.notify()
+        return event_id
+
+    def read(self, after_id: int, camera_id: Optional[str] = None, limit: Optional[int] = None) -> AlertRead:
+        """
+        Events newer than after_id, oldest first, optionally for one camera only.
+
+        Returns:
+            AlertRead whose cursor has moved past every event examined (including other cameras')
+        """
+        with self._lock:
+            if after_id >= self.last_id:
+                # Nothing new; a cursor ahead of the bus (from before a restart) resumes at the head
+                return AlertRead([], self.last_id, 0)
+
+            first_id = self._events[0].id
+            missed = max(0, first_id - after_id - 1)
+            start = max(0, after_id - first_id + 1)
+
+            events: List[AlertEvent] = []
+            cursor = max(after_id, first_id - 1)
+            for event in islice(self._events, start, None):
+                cursor = event.id
+                if camera_id is None or event.camera_id == camera_id:
+                    events.append(event)
+                    if limit is not None and len(events) >= limit:
+                        break
+            return AlertRead(events, cursor, missed)
+
+    def add_waiter(self, event: Optional[asyncio.Event] = None) -> asyncio.Event:
+        """asyncio.Event set on every publish; call from the event loop and remove it when done."""
+        return self._notifier.add_waiter(event)
+
+    def remove_waiter(self, event: asyncio.Event) -> None:
+        self._notifier.remove_waiter(event)
+
+    def get_stats(self) -> Dict:
+        """Get bus statistics."""
+        with self._lock:
+            return {
+                'published': self.published,
+                'last_id': self.last_id,
+                'buffered': len(self._events),
+                'capacity': self.capacity,
+                'subscribers': self._notifier.waiters,
+            }
+
+
+alert_bus: Optional[AlertBus] = None
+_bus_lock = threading.Lock()
+
+
+def get_alert_bus() -> AlertBus:
+    """Get or create the process-wide alert bus."""
+    global alert_bus
+    with _bus_lock:
+        if alert_bus is None:
+            alert_bus = AlertBus()
+        return alert_bus
@@ -2,19 +2,30 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
+import time
 import uuid
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Literal, Optional, Tuple, Union
 
-from fastapi import Depends, FastAPI, Header, HTTPException, status
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request, WebSocket, status
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from pydantic import BaseModel, Field, field_validator
 
 from auth_manager import AuthManager
+from backend.alert_bus import AlertBus, get_alert_bus
 from backend.alert_service import move_to_verified_alerts
-from backend.live_detection import LiveDetectionWorker, get_worker, get_worker_dual_1, get_worker_dual_2
+from backend.camera_registry import get_camera_registry
+from backend.live_detection import LiveDetectionWorker, get_alert_writer
+from backend.live_push import LiveSubscriber
+from background_model import BACKGROUND_METHODS
+from cctv_detector import parse_roi_polygons
+from motion_engines import MOTION_ENGINES
 
 app = FastAPI(title="CCTV Crime Detection API", version="1.0.0")
 app.add_middleware(
@@ -28,8 +39,21 @@ auth_manager = AuthManager()
 SESSIONS: Dict[str, Dict[str, Any]] = {}
 SESSION_TTL = timedelta(hours=12)
 
-# Support for dual camera streams
-USE_DUAL_CAMERAS = False  # Set to True to enable 2-camera mode
+# Camera behind the single-camera /live/* endpoints
+DEFAULT_CAMERA_ID = "default"
+
+# MJPEG live view: per-client frame-rate cap
+MJPEG_BOUNDARY = "frame"
+MJPEG_DEFAULT_FPS = 15
+MJPEG_MAX_FPS = 30
+
+# Conditional (If-None-Match / since) and long-poll frame and stats requests
+LONG_POLL_MAX_S = 30.0
+STREAM_CHECK_S = 1.0  # Idle streams re-check camera state and client disconnects this often
+
+# Server-Sent Events alert stream
+SSE_RETRY_MS = 3000  # Browser reconnect delay (it resumes with Last-Event-ID)
+SSE_KEEPALIVE_S = 15.0
 
 
 class LoginRequest(BaseModel):
@@ -59,6 +83,34 @@ class LiveControl(BaseModel):
     active: bool
 
 
+class CameraConfig(BaseModel):
+    camera_id: str = Field(..., pattern="^[A-Za-z0-9_-]{1,64}$")
+    source: Union[int, str]  # Webcam index, file path, RTSP/HTTP URL
+    name: Optional[str] = None
+    autostart: bool = False
+    fps_target: int = 30
+    crime_threshold: float = 0.35
+    cascade: bool = False
+    roi: Optional[List[List[Tuple[float, float]]]] = None
+    inference_mode: Literal["single", "tiled"] = "single"
+    track_interval: int = Field(1, ge=1)
+    motion_engine: Literal[MOTION_ENGINES] = "farneback"  # type: ignore[valid-type]
+    motion_width: Optional[int] = Field(None, gt=0)
+    person_model: Literal[("edges",) + BACKGROUND_METHODS] = "mog2"  # type: ignore[valid-type]
+
+    @field_validator("roi")
+    @classmethod
+    def _check_roi(cls, roi):
+        # Rejected here (422) rather than when the worker is built
+        if roi:
+            parse_roi_polygons(roi)
+        return roi
+
+
+class CameraSource(BaseModel):
+    source: Union[int, str]
+
+
 def create_session(username: str, role: str) -> str:
     token = uuid.uuid4().hex
     SESSIONS[token] = {
@@ -85,12 +137,227 @@ def resolve_admin(user=Depends(resolve_user)):
     return user
 
 
+def get_camera(camera_id: str) -> LiveDetectionWorker:
+    worker = get_camera_registry().get(camera_id)
+    if worker is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Unknown camera: {camera_id}")
+    return worker
+
+
+def _apply_settings(camera_id: str, settings: LiveSettings) -> None:
+    worker = get_camera(camera_id)
+    worker.update_settings(
+        fps_target=settings.fps_target,
+        crime_threshold=settings.crime_threshold,
+        show_boxes=settings.show_boxes,
+        show_weapons=settings.show_weapons,
+    )
+    get_camera_registry().update(camera_id, **settings.model_dump())
+
+
+def _set_running(worker: LiveDetectionWorker, active: bool) -> bool:
+    if active and not worker.running:
+        worker.start()
+    elif not active and worker.running:
+        worker.stop()
+    return worker.running
+
+
+def _stream_active(camera_id: str, worker: LiveDetectionWorker) -> bool:
+    """A live stream keeps going while its camera is still registered and running."""
+    return get_camera_registry().get(camera_id) is worker and worker.running
+
+
+async def _mjpeg_parts(request: Request, camera_id: str, worker: LiveDetectionWorker, max_fps: float,
+                       quality: Optional[int]):
+    """Yield the newest JPEG as a multipart part whenever a new frame exists, at most max_fps.
+
+    Each part is only produced once the previous one has been sent, so a slow client skips
+    straight to the newest frame instead of queueing old ones. Waiting never holds a thread.
+    The stream ends when the camera is stopped or removed, or the client goes away.
+    """
+    interval = 1.0 / max_fps
+    last_seq = 0
+    wake = worker.changes.add_waiter()
+    try:
+        while True:
+            if not _stream_active(camera_id, worker) or await request.is_disconnected():
+                return
+            started = time.monotonic()
+            wake.clear()
+            # Encoding (shared with every other viewer of this frame) runs off the event loop
+            encoded = None
+            if worker.encoder.seq != last_seq:
+                encoded = await run_in_threadpool(worker.get_frame_jpeg, quality)
+            if encoded is None:
+                # Woken by the worker's next frame or state change (stop included)
+                try:
+                    await asyncio.wait_for(wake.wait(), STREAM_CHECK_S)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            last_seq, data = encoded
+            yield (
+                f"--{MJPEG_BOUNDARY}\r\nContent-Type: image/jpeg\r\nContent-Length: {len(data)}\r\n\r\n".encode()
+                + data + b"\r\n"
+            )
+
+            remaining = interval - (time.monotonic() - started)
+            if remaining > 0:
+                await asyncio.sleep(remaining)
+    finally:
+        worker.changes.remove_waiter(wake)
+
+
+def _mjpeg_response(request: Request, camera_id: str, fps: float, quality: Optional[int]) -> StreamingResponse:
+    return StreamingResponse(
+        _mjpeg_parts(request, camera_id, get_camera(camera_id), fps, quality),
+        media_type=f"multipart/x-mixed-replace; boundary={MJPEG_BOUNDARY}",
+        headers={"Cache-Control": "no-cache, no-store", "X-Accel-Buffering": "no"},
+    )
+
+
+def _etag(worker: LiveDetectionWorker, kind: str, seq: int) -> str:
+    return f'"{worker.instance_id}-{kind}{seq}"'
+
+
+def _client_seq(worker: LiveDetectionWorker, kind: str, since: Optional[int],
+                if_none_match: Optional[str]) -> Optional[int]:
+    """Sequence number the client already has: `since`, or the one in a matching If-None-Match."""
+    if since is not None:
+        return since
+    prefix = f'"{worker.instance_id}-{kind}'
+    for tag in (if_none_match or "").split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag.startswith(prefix) and tag.endswith('"') and tag[len(prefix):-1].isdigit():
+            return int(tag[len(prefix):-1])
+    return None
+
+
+async def _wait_for_change(worker: LiveDetectionWorker, current: Callable[[], int], known: Optional[int],
+                           wait: float) -> int:
+    """Long-poll: return current() as soon as it differs from known, or when wait runs out."""
+    seq = current()
+    if known is None or seq != known or wait <= 0:
+        return seq
+    wake = worker.changes.add_waiter()
+    try:
+        deadline = time.monotonic() + wait
+        while True:
+            wake.clear()
+            seq = current()
+            remaining = deadline - time.monotonic()
+            if seq != known or remaining <= 0:
+                return seq
+            try:
+                await asyncio.wait_for(wake.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        worker.changes.remove_waiter(wake)
+
+
+def _not_modified(etag: str, since: Optional[int], body: Dict[str, Any]) -> Response:
+    # If-None-Match gets a real 304; `since` polls get a small 200 body (simpler for fetch/axios)
+    if since is None:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return JSONResponse({**body, "modified": False}, headers={"ETag": etag})
+
+
+async def _frame_response(worker: LiveDetectionWorker, since: Optional[int], wait: float,
+                          if_none_match: Optional[str], **extra: Any) -> Response:
+    """Latest frame as a data URI with its sequence number, unless the client already has it."""
+    known = _client_seq(worker, "f", since, if_none_match)
+    seq = await _wait_for_change(worker, lambda: worker.encoder.seq, known, wait)
+    if known is not None and seq == known:
+        return _not_modified(_etag(worker, "f", seq), since, {"frame": "", "seq": seq, **extra})
+
+    encoded = await run_in_threadpool(worker.encoder.get_data_uri)
+    if encoded is None:
+        # Return empty string instead of 404 to avoid frontend errors during initialization
+        return JSONResponse({"frame": "", "seq": 0, **extra})
+    seq, frame = encoded
+    return JSONResponse(
+        {"frame": frame, "seq": seq, **extra},
+        headers={"ETag": _etag(worker, "f", seq), "Cache-Control": "no-cache"},
+    )
+
+
+async def _stats_response(worker: LiveDetectionWorker, since: Optional[int], wait: float,
+                          if_none_match: Optional[str]) -> Response:
+    """Worker state (with its seq), unless the client already has this snapshot."""
+    known = _client_seq(worker, "s", since, if_none_match)
+    seq = await _wait_for_change(worker, lambda: worker.state_seq, known, wait)
+    if known is not None and seq == known:
+        return _not_modified(_etag(worker, "s", seq), since, {"seq": seq})
+
+    state = worker.get_state()
+    return JSONResponse(
+        jsonable_encoder(state),
+        headers={"ETag": _etag(worker, "s", state["seq"]), "Cache-Control": "no-cache"},
+    )
+
+
+def _read_alerts(camera_id: Optional[str], since: Optional[int], limit: int) -> Dict[str, Any]:
+    """
+    Buffered live alerts after `since` (the last_id of a previous response); nothing is drained.
+
+    Without `since` only the current last_id is returned, so a client joins at the head of the
+    bus instead of downloading the whole ring buffer; it should pass `since` from then on.
+    """
+    bus = get_alert_bus()
+    if since is None:
+        return {"alerts": [], "last_id": bus.last_id, "missed": 0}
+    read = bus.read(since, camera_id, limit)
+    return {
+        "alerts": [{"event_id": event.id, **event.alert} for event in read.events],
+        "last_id": read.cursor,
+        "missed": read.missed,
+    }
+
+
+async def _alert_events(bus: AlertBus, after_id: int, camera_id: Optional[str]):
+    """SSE body: every alert after after_id, then new ones as they are published (no polling)."""
+    wake = bus.add_waiter()
+    try:
+        yield f"retry: {SSE_RETRY_MS}\n\n"
+        while True:
+            wake.clear()
+            read = bus.read(after_id, camera_id)
+            after_id = read.cursor
+            if read.missed:
+                # Resumed from an id that has already left the buffer
+                yield f"event: gap\ndata: {json.dumps({'missed': read.missed})}\n\n"
+            for event in read.events:
+                yield f"id: {event.id}\nevent: alert\ndata: {json.dumps(event.alert, default=str)}\n\n"
+            if read.events:
+                continue
+            try:
+                await asyncio.wait_for(wake.wait(), SSE_KEEPALIVE_S)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+    finally:
+        bus.remove_waiter(wake)
+
+
+@app.on_event("shutdown")
+def stop_cameras() -> None:
+    get_camera_registry().stop_all()
+
+
 @app.get("/health")
 def health() -> Dict[str, Any]:
-    worker = get_worker()
+    cameras = get_camera_registry().list()
+    default = get_camera_registry().get(DEFAULT_CAMERA_ID)
     return {
         "status": "ok",
-        "worker_running": worker.running,
+        "worker_running": bool(default and default.running),
+        "cameras": len(cameras),
+        "cameras_running": sum(1 for camera in cameras if camera["running"]),
+        "alert_bus": get_alert_bus().get_stats(),
+        "alert_writer": get_alert_writer().get_stats(),
         "timestamp": datetime.utcnow().isoformat(),
     }
 
@@ -113,39 +380,43 @@ def register(payload: RegisterRequest, user=Depends(resolve_admin)):
 
 
 @app.get("/live/stats")
-def live_stats():
-    worker = get_worker()
-    return worker.get_state()
+async def live_stats(
+    since: Optional[int] = Query(None, ge=0),
+    wait: float = Query(0, ge=0, le=LONG_POLL_MAX_S),
+    if_none_match: Optional[str] = Header(default=None),
+):
+    return await _stats_response(get_camera(DEFAULT_CAMERA_ID), since, wait, if_none_match)
 
 
 @app.get("/live/frame")
-def live_frame():
-    worker = get_worker()
-    frame = worker.get_frame_base64()
-    # Return empty string instead of 404 to avoid frontend errors during initialization
-    return {"frame": frame or ""}
+async def live_frame(
+    since: Optional[int] = Query(None, ge=0),
+    wait: float = Query(0, ge=0, le=LONG_POLL_MAX_S),
+    if_none_match: Optional[str] = Header(default=None),
+):
+    """Latest frame; with since/If-None-Match only when newer (wait > 0 long-polls for the next one)."""
+    return await _frame_response(get_camera(DEFAULT_CAMERA_ID), since, wait, if_none_match)
+
+
+@app.get("/live/mjpeg")
+def live_mjpeg(
+    request: Request,
+    fps: float = Query(MJPEG_DEFAULT_FPS, gt=0, le=MJPEG_MAX_FPS),
+    quality: Optional[int] = Query(None, ge=10, le=95),
+):
+    """MJPEG stream of the default camera (use directly as an <img> src)."""
+    return _mjpeg_response(request, DEFAULT_CAMERA_ID, fps, quality)
 
 
 @app.post("/live/settings")
 def update_settings(settings: LiveSettings, user=Depends(resolve_admin)):
-    worker = get_worker()
-    worker.update_settings(
-        fps_target=settings.fps_target,
-        crime_threshold=settings.crime_threshold,
-        show_boxes=settings.show_boxes,
-        show_weapons=settings.show_weapons,
-    )
+    _apply_settings(DEFAULT_CAMERA_ID, settings)
     return {"message": "Settings updated"}
 
 
 @app.post("/live/control")
 def control_worker(control: LiveControl, user=Depends(resolve_admin)):
-    worker = get_worker()
-    if control.active and not worker.running:
-        worker.start()
-    elif not control.active and worker.running:
-        worker.stop()
-    return {"running": worker.running}
+    return {"running": _set_running(get_camera(DEFAULT_CAMERA_ID), control.active)}
 
 
 @app.get("/alerts/recent")
@@ -168,86 +439,172 @@ def verify_alert(alert_id: str, body: VerifyRequest, user=Depends(resolve_admin)
 
 
 @app.get("/alerts/live")
-def live_alert_queue():
-    worker = get_worker()
-    return {"alerts": worker.flush_alerts()}
+def live_alerts(
+    since: Optional[int] = Query(None, ge=0),
+    camera_id: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+):
+    """Recent live alerts from every camera (or one); pass the returned last_id as since."""
+    return _read_alerts(camera_id, since, limit)
+
+
+@app.get("/alerts/stream")
+def alert_stream(
+    camera_id: Optional[str] = None,
+    since: Optional[int] = Query(None, ge=0),
+    last_event_id: Optional[int] = Header(default=None, alias="Last-Event-ID"),
+):
+    """Server-Sent Events: live alerts as they happen; reconnects resume from Last-Event-ID."""
+    bus = get_alert_bus()
+    after_id = last_event_id if last_event_id is not None else since
+    return StreamingResponse(
+        _alert_events(bus, bus.last_id if after_id is None else after_id, camera_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.websocket("/ws/live")
+async def live_socket(websocket: WebSocket):
+    """Push channel: subscribe to cameras and channels (frames, stats, alerts) over one socket."""
+    await websocket.accept()
+    await LiveSubscriber(websocket, get_camera_registry(), get_alert_bus()).run()
+
+
+# ============ CAMERA REGISTRY ENDPOINTS ============
+
+@app.get("/cameras")
+def list_cameras():
+    """List registered cameras with their running status."""
+    return {"cameras": get_camera_registry().list()}
+
+
+@app.post("/cameras", status_code=status.HTTP_201_CREATED)
+def add_camera(config: CameraConfig, user=Depends(resolve_admin)):
+    """Register a camera (persisted; started immediately when autostart is set)."""
+    try:
+        return get_camera_registry().add(config.model_dump())
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@app.delete("/cameras/{camera_id}")
+def remove_camera(camera_id: str, user=Depends(resolve_admin)):
+    """Stop and unregister a camera."""
+    if not get_camera_registry().remove(camera_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Unknown camera: {camera_id}")
+    return {"camera_id": camera_id, "removed": True}
+
+
+@app.get("/cameras/{camera_id}/stats")
+async def camera_stats(
+    camera_id: str,
+    since: Optional[int] = Query(None, ge=0),
+    wait: float = Query(0, ge=0, le=LONG_POLL_MAX_S),
+    if_none_match: Optional[str] = Header(default=None),
+):
+    return await _stats_response(get_camera(camera_id), since, wait, if_none_match)
+
+
+@app.get("/cameras/{camera_id}/frame")
+async def camera_frame(
+    camera_id: str,
+    since: Optional[int] = Query(None, ge=0),
+    wait: float = Query(0, ge=0, le=LONG_POLL_MAX_S),
+    if_none_match: Optional[str] = Header(default=None),
+):
+    return await _frame_response(get_camera(camera_id), since, wait, if_none_match, camera_id=camera_id)
+
+
+@app.get("/cameras/{camera_id}/mjpeg")
+def camera_mjpeg(
+    request: Request,
+    camera_id: str,
+    fps: float = Query(MJPEG_DEFAULT_FPS, gt=0, le=MJPEG_MAX_FPS),
+    quality: Optional[int] = Query(None, ge=10, le=95),
+):
+    """MJPEG stream of one camera; fps caps this client's frame rate."""
+    return _mjpeg_response(request, camera_id, fps, quality)
+
+
+@app.post("/cameras/{camera_id}/control")
+def control_camera(camera_id: str, control: LiveControl, user=Depends(resolve_admin)):
+    return {"camera_id": camera_id, "running": _set_running(get_camera(camera_id), control.active)}
+
+
+@app.post("/cameras/{camera_id}/settings")
+def update_camera_settings(camera_id: str, settings: LiveSettings, user=Depends(resolve_admin)):
+    _apply_settings(camera_id, settings)
+    return {"message": f"Settings updated for camera {camera_id}"}
+
+
+@app.post("/cameras/{camera_id}/source")
+def update_camera_source(camera_id: str, body: CameraSource, user=Depends(resolve_admin)):
+    """Point a camera at a new source (restarts it if it was running)."""
+    get_camera(camera_id)
+    if not get_camera_registry().set_source(camera_id, body.source):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Could not open the new source")
+    return get_camera_registry().describe(camera_id)
+
+
+@app.get("/cameras/{camera_id}/alerts")
+def camera_alerts(camera_id: str, since: Optional[int] = Query(None, ge=0), limit: int = Query(100, ge=1, le=1000)):
+    get_camera(camera_id)
+    return {**_read_alerts(camera_id, since, limit), "camera_id": camera_id}
 
 
 # ============ DUAL CAMERA ENDPOINTS ============
+# Kept for the dual-camera dashboard; cameras "1" and "2" in the registry
 
 @app.get("/live/dual/stats")
 def live_dual_stats():
     """Get stats from both cameras."""
-    worker1 = get_worker_dual_1()
-    worker2 = get_worker_dual_2()
     return {
-        "camera_1": worker1.get_state(),
-        "camera_2": worker2.get_state(),
+        "camera_1": get_camera("1").get_state(),
+        "camera_2": get_camera("2").get_state(),
     }
 
 
 @app.get("/live/dual/frame/{camera_id}")
-def live_dual_frame(camera_id: int):
+async def live_dual_frame(
+    camera_id: int,
+    since: Optional[int] = Query(None, ge=0),
+    wait: float = Query(0, ge=0, le=LONG_POLL_MAX_S),
+    if_none_match: Optional[str] = Header(default=None),
+):
     """Get frame from specific camera (1 or 2)."""
-    if camera_id == 1:
-        worker = get_worker_dual_1()
-    elif camera_id == 2:
-        worker = get_worker_dual_2()
-    else:
-        raise HTTPException(status_code=400, detail="camera_id must be 1 or 2")
-    
-    frame = worker.get_frame_base64()
-    return {"frame": frame or "", "camera_id": camera_id}
+    return await _frame_response(get_camera(str(camera_id)), since, wait, if_none_match, camera_id=camera_id)
+
+
+@app.get("/live/dual/mjpeg/{camera_id}")
+def live_dual_mjpeg(
+    request: Request,
+    camera_id: int,
+    fps: float = Query(MJPEG_DEFAULT_FPS, gt=0, le=MJPEG_MAX_FPS),
+    quality: Optional[int] = Query(None, ge=10, le=95),
+):
+    """MJPEG stream of a specific camera (1 or 2)."""
+    return _mjpeg_response(request, str(camera_id), fps, quality)
 
 
 @app.post("/live/dual/control/{camera_id}")
 def control_dual_worker(camera_id: int, control: LiveControl, user=Depends(resolve_admin)):
     """Start/stop specific camera."""
-    if camera_id == 1:
-        worker = get_worker_dual_1()
-    elif camera_id == 2:
-        worker = get_worker_dual_2()
-    else:
-        raise HTTPException(status_code=400, detail="camera_id must be 1 or 2")
-    
-    if control.active and not worker.running:
-        worker.start()
-    elif not control.active and worker.running:
-        worker.stop()
-    
-    return {"camera_id": camera_id, "running": worker.running}
+    return {"camera_id": camera_id, "running": _set_running(get_camera(str(camera_id)), control.active)}
 
 
 @app.post("/live/dual/settings/{camera_id}")
 def update_dual_settings(camera_id: int, settings: LiveSettings, user=Depends(resolve_admin)):
     """Update settings for specific camera."""
-    if camera_id == 1:
-        worker = get_worker_dual_1()
-    elif camera_id == 2:
-        worker = get_worker_dual_2()
-    else:
-        raise HTTPException(status_code=400, detail="camera_id must be 1 or 2")
-    
-    worker.update_settings(
-        fps_target=settings.fps_target,
-        crime_threshold=settings.crime_threshold,
-        show_boxes=settings.show_boxes,
-        show_weapons=settings.show_weapons,
-    )
+    _apply_settings(str(camera_id), settings)
     return {"message": f"Settings updated for camera {camera_id}"}
 
 
 @app.get("/alerts/live/dual/{camera_id}")
-def live_dual_alerts(camera_id: int):
+def live_dual_alerts(camera_id: int, since: Optional[int] = Query(None, ge=0), limit: int = Query(100, ge=1, le=1000)):
     """Get live alerts from specific camera."""
-    if camera_id == 1:
-        worker = get_worker_dual_1()
-    elif camera_id == 2:
-        worker = get_worker_dual_2()
-    else:
-        raise HTTPException(status_code=400, detail="camera_id must be 1 or 2")
-    
-    return {"alerts": worker.flush_alerts(), "camera_id": camera_id}
+    get_camera(str(camera_id))
+    return {**_read_alerts(str(camera_id), since, limit), "camera_id": camera_id}
 
 
 def _load_alerts(metadata_dir: Path, limit: int) -> Dict[str, List[Dict[str, Any]]]:  # type: ignore[type-arg]
@@ -0,0 +1,184 @@
+"""Runtime registry of live cameras: persisted definitions and worker lifecycles."""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from backend.live_detection import LiveDetectionWorker, get_detection_engine, get_stage_executor
+
+CAMERA_REGISTRY_PATH = os.getenv("CAMERA_REGISTRY_PATH", "cameras.json")
+
+CAMERA_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+# Definition keys passed straight to LiveDetectionWorker
+WORKER_OPTIONS = (
+    "fps_target", "crime_threshold", "show_boxes", "show_weapons", "cascade", "roi",
+    "inference_mode", "track_interval", "motion_engine", "motion_width", "person_model",
+)
+
+# Seeded on first run so the single-camera and dual-camera endpoints keep working
+DEFAULT_CAMERAS: List[Dict[str, Any]] = [
+    {"camera_id": "default", "name": "Default camera", "source": 0},  # Webcam 0; change to URL/file as needed
+    {"camera_id": "1", "name": "Camera 1", "source": 0},  # First webcam
+    {"camera_id": "2", "name": "Camera 2", "source": "http://100.76.107.130:8080/video",  # IP webcam URL
+     "fps_target": 10},  # Wireless IP stream: analyse fewer frames
+]
+
+
+class CameraRegistry:
+    """Adds, removes and lists cameras at runtime; one LiveDetectionWorker per camera.
+
+    Workers share the process-wide model engine and stage pool, so a camera costs two
+    threads (capture + detection) and its per-camera state; the number of cameras per host
+    is bounded by CPU, with each camera's pacer backing off when the host saturates.
+    """
+
+    def __init__(self, path: str | Path = CAMERA_REGISTRY_PATH) -> None:
+        self.path = Path(path)
+        self._definitions: Dict[str, Dict[str, Any]] = {}
+        self._workers: Dict[str, LiveDetectionWorker] = {}
+        self._lock = threading.RLock()
+        self._load()
+
+    def _load(self) -> None:
+        """Load persisted definitions (or seed the defaults) and start autostart cameras."""
+        definitions = DEFAULT_CAMERAS
+        if self.path.exists():
+            try:
+                definitions = json.loads(self.path.read_text(encoding="utf-8")).get("cameras", [])
+            except Exception as e:
+                print(f"⚠️ Could not read camera registry {self.path}: {e}")
+                definitions = []
+
+        for definition in definitions:
+            try:
+                self.add(definition, persist=False)
+            except ValueError as e:
+                print(f"⚠️ Skipping camera {definition.get('camera_id')}: {e}")
+        if not self.path.exists():
+            self._save()
+
+    def _save(self) -> None:
+        """Persist definitions atomically (write a temp file, then rename over the old one)."""
+        with self._lock:
+            payload = {"cameras": list(self._definitions.values())}
+            tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+            tmp.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+            os.replace(tmp, self.path)
+
+    def add(self, definition: Dict[str, Any], persist: bool = True) -> Dict[str, Any]:
+        """Register a camera and create its worker (started right away if autostart is set).
+
+        Raises:
+            ValueError: If the camera id is invalid or taken, or a worker option is invalid
+        """
+        definition = {k: v for k, v in definition.items() if v is not None}
+        camera_id = str(definition.get("camera_id", ""))
+        if not CAMERA_ID_PATTERN.match(camera_id):
+            raise ValueError("camera_id must be 1-64 letters, digits, '-' or '_'")
+        if "source" not in definition:
+            raise ValueError("source is required")
+        definition["camera_id"] = camera_id
+
+        with self._lock:
+            if camera_id in self._definitions:
+                raise ValueError(f"Camera {camera_id} already exists")
+            worker = self._create_worker(definition)
+            self._definitions[camera_id] = definition
+            self._workers[camera_id] = worker
+
+        if persist:
+            self._save()
+        if definition.get("autostart"):
+            try:
+                worker.start()
+            except Exception as e:
+                print(f"⚠️ Camera {camera_id} did not start: {e}")
+        return self.describe(camera_id)
+
+    def _create_worker(self, definition: Dict[str, Any]) -> LiveDetectionWorker:
+        options = {k: definition[k] for k in WORKER_OPTIONS if k in definition}
+        return LiveDetectionWorker(
+            video_source=definition["source"],
+            camera_id=definition["camera_id"],
+            engine=get_detection_engine(),
+            stage_executor=get_stage_executor(),
+            **options,
+        )
+
+    def remove(self, camera_id: str) -> bool:
+        """Stop a camera's worker and forget the camera. Returns False if it was unknown."""
+        with self._lock:
+            worker = self._workers.pop(camera_id, None)
+            removed = self._definitions.pop(camera_id, None) is not None
+        if worker and worker.running:
+            worker.stop()
+        if removed:
+            self._save()
+        return removed
+
+    def get(self, camera_id: str) -> Optional[LiveDetectionWorker]:
+        """Worker for a camera, or None if it is not registered."""
+        with self._lock:
+            return self._workers.get(camera_id)
+
+    def update(self, camera_id: str, **changes: Any) -> None:
+        """Record changed worker settings (already applied to the worker) in the persisted definition."""
+        with self._lock:
+            definition = self._definitions.get(camera_id)
+            if definition is None:
+                return
+            definition.update(changes)
+        self._save()
+
+    def set_source(self, camera_id: str, source: str | int) -> bool:
+        """Point a camera at a new source (its worker restarts if it was running)."""
+        worker = self.get(camera_id)
+        if worker is None or not worker.change_video_source(source):
+            return False
+        self.update(camera_id, source=source)
+        return True
+
+    def describe(self, camera_id: str) -> Dict[str, Any]:
+        """Definition plus live status of one camera.
+
+        Raises:
+            KeyError: If the camera is not registered
+        """
+        with self._lock:
+            definition = dict(self._definitions[camera_id])
+            worker = self._workers[camera_id]
+            definition["running"] = worker.running
+            definition["source_type"] = worker.source_type
+            return definition
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Every registered camera with its live status."""
+        with self._lock:
+            return [self.describe(camera_id) for camera_id in self._definitions]
+
+    def stop_all(self) -> None:
+        """Stop every running worker (server shutdown)."""
+        with self._lock:
+            workers = list(self._workers.values())
+        for worker in workers:
+            if worker.running:
+                worker.stop()
+
+
+camera_registry: Optional[CameraRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_camera_registry() -> CameraRegistry:
+    """Get or create the process-wide camera registry."""
+    global camera_registry
+    with _registry_lock:
+        if camera_registry is None:
+            camera_registry = CameraRegistry()
+        return camera_registry
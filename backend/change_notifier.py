@@ -0,0 +1,51 @@
+"""Wake asyncio waiters from any thread when something they watch has changed."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Optional, Set, Tuple
+
+
+class ChangeNotifier:
+    """
+    A set of asyncio.Events, each bound to its event loop, that notify() sets from any thread.
+
+    Waiters clear their event, check the state they care about, then wait on the event; a
+    change that lands in between still sets it, so no wakeup is lost. Nothing is queued.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._waiters: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = set()
+
+    def notify(self) -> None:
+        """Wake every waiter (callable from any thread)."""
+        with self._lock:
+            waiters = list(self._waiters)
+        for loop, event in waiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:  # Loop already closed; the waiter is being torn down
+                pass
+
+    def add_waiter(self, event: Optional[asyncio.Event] = None) -> asyncio.Event:
+        """
+        asyncio.Event set on every notify(); call from the event loop and remove it when done.
+
+        Pass an existing event to wait on several notifiers at once.
+        """
+        if event is None:
+            event = asyncio.Event()
+        with self._lock:
+            self._waiters.add((asyncio.get_running_loop(), event))
+        return event
+
+    def remove_waiter(self, event: asyncio.Event) -> None:
+        with self._lock:
+            self._waiters = {waiter for waiter in self._waiters if waiter[1] is not event}
+
+    @property
+    def waiters(self) -> int:
+        with self._lock:
+            return len(self._waiters)
@@ -3,18 +3,25 @@
 
 from __future__ import annotations
 
-import base64
+import os
 import threading
 import time
-import queue
+import uuid
 from collections import deque
 from datetime import datetime
+from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 import cv2
 
-from alert_logger import AlertLogger
-from cctv_detector import CCTVCrimeDetector
+from alert_logger import AlertLogger, AlertWriter, migrate_daily_logs
+from backend.alert_bus import AlertBus, get_alert_bus
+from backend.change_notifier import ChangeNotifier
+from cctv_detector import CCTVCrimeDetector, DetectionEngine, get_shared_engine
+from frame_encoder import FrameEncoder
+from frame_grabber import FrameGrabber
+from frame_pacer import FramePacer
+from stage_executor import StageExecutor, default_thread_budget
 
 
 class LiveDetectionWorker:
@@ -27,29 +34,67 @@ class LiveDetectionWorker:
         show_boxes: bool = True,
         show_weapons: bool = True,
         video_source: str | int = 0,  # 0 = webcam, or URL/file path
+        camera_id: Optional[str] = None,  # Registry id, reported with stats and alerts
+        engine: Optional[DetectionEngine] = None,  # Shared model (default: process-wide engine)
+        cascade: bool = False,  # Only run full detection on frames with motion (plus keep-alive)
+        roi: Optional[List[List[Tuple[float, float]]]] = None,  # Polygons in normalised [0, 1] coords
+        inference_mode: str = "single",  # "tiled" runs overlapping 640 tiles for long-range detection
+        track_interval: int = 1,  # Weapon inference every N frames, tracked boxes in between
+        stage_executor: Optional[StageExecutor] = None,  # Run detector stages concurrently
+        motion_engine: str = "farneback",  # farneback | dis_ultrafast | dis_fast | lk | diff
+        motion_width: Optional[int] = None,  # Motion working width (None = analysis resolution)
+        person_model: str = "mog2",  # mog2 | knn | running_avg | edges (clustering person regions)
+        alert_bus: Optional[AlertBus] = None,  # Live alert fan-out (default: process-wide bus)
     ) -> None:
         self.fps_target = fps_target
         self.crime_threshold = crime_threshold
         self.show_boxes = show_boxes
         self.show_weapons = show_weapons
         self.video_source = video_source  # Webcam index, file path, RTSP URL, etc.
+        self.camera_id = camera_id
+        self.pacer = FramePacer(fps_target)  # Backs off below fps_target when the host can't keep up
 
         self.source_type = self._detect_source_type(video_source)
 
-        self.detector = CCTVCrimeDetector()
-        self.alert_logger = AlertLogger("alerts")
+        # Cameras share one model engine; only the per-camera DetectorState is created here
+        self.detector = CCTVCrimeDetector(
+            engine=engine,
+            cascade=cascade,
+            inference_mode=inference_mode,
+            track_interval=track_interval,
+            stage_executor=stage_executor,
+            motion_engine=motion_engine,
+            motion_width=motion_width,
+            person_model=person_model,
+        )
+        self.detector.set_roi(roi)
+        # Cameras on a batching engine batch their inference calls together
+        self.inference_scheduler = self.detector.engine.inference_scheduler
+        self._scheduler_registered = False
+        # Alert files are written on the shared writer thread, not in the detection loop
+        self.alert_logger = AlertLogger(ALERT_DIR, writer=get_alert_writer())
+        self.alert_bus = alert_bus or get_alert_bus()
 
         self.capture: Optional[cv2.VideoCapture] = None
+        self.grabber: Optional[FrameGrabber] = None  # Capture thread feeding the latest-frame slot
         self.thread: Optional[threading.Thread] = None
 
-        self.latest_frame_bytes: Optional[bytes] = None
+        # Latest analysed frame; JPEG/base64 only produced when a viewer asks for it
+        self.encoder = FrameEncoder(
+            default_quality=60 if self._is_network_source() else 80,  # Higher compression for wireless
+            render=self._render_display,
+        )
         self.latest_results: Optional[Dict[str, Any]] = None
         self.frame_count = 0
         self.crime_count = 0
         self.frame_times: deque[float] = deque(maxlen=120)
+        self.latencies: deque[float] = deque(maxlen=120)  # Capture -> published, seconds
         self.connection_error_count = 0
+        # Versions for conditional/long-poll requests: encoder.seq per frame, state_seq per stats change
+        self.instance_id = uuid.uuid4().hex[:8]  # Scopes sequence numbers to this worker
+        self.state_seq = 0
+        self.changes = ChangeNotifier()  # Wakes long-polls and streams on a new frame or state
 
-        self._alerts_queue: "queue.Queue[Dict[str, Any]]" = queue.Queue()
         self._lock = threading.Lock()
         self._running = False
 
@@ -113,10 +158,27 @@ class LiveDetectionWorker:
                 except:
                     pass
 
+            # Files decode much faster than real time; replay them at their native rate
+            pace_fps = None
+            if self.source_type == "file":
+                pace_fps = self.capture.get(cv2.CAP_PROP_FPS) or self.fps_target
+            # Frames beyond the analysis rate are grabbed but never decoded
+            self.grabber = FrameGrabber(
+                self.capture,
+                pace_fps=pace_fps,
+                max_fps=self.pacer.rate,
+                log_failures=self.source_type in ["rtsp", "http", "ip_webcam"],
+            )
+
             print(f"✅ Video source opened successfully: {self.source_type}")
+            if self.inference_scheduler and not self._scheduler_registered:
+                self.inference_scheduler.register()
+                self._scheduler_registered = True
             self._running = True
+            self.grabber.start()
             self.thread = threading.Thread(target=self._run, daemon=True)
             self.thread.start()
+            self._state_changed()
             
         except Exception as e:
             print(f"❌ Error starting video capture: {e}")
@@ -130,11 +192,28 @@ class LiveDetectionWorker:
         time.sleep(0.1)  # Give thread time to exit cleanly
         if self.thread and self.thread.is_alive():
             self.thread.join(timeout=2)
-        if self.capture:
+        self._release_scheduler()
+        if self.grabber:
+            self.grabber.stop()  # Releases the capture once its read returns
+            self.grabber = None
+        elif self.capture:
             self.capture.release()
-            self.capture = None
+        self.capture = None
+        self._state_changed()
         print(f"✅ Video capture stopped: {self.source_type}")
 
+    def _state_changed(self) -> None:
+        """Advance the stats sequence number (anything get_state reports has changed)."""
+        with self._lock:
+            self.state_seq += 1
+        self.changes.notify()
+
+    def _release_scheduler(self) -> None:
+        """Stop counting this camera when the shared scheduler sizes its batches."""
+        if self.inference_scheduler and self._scheduler_registered:
+            self.inference_scheduler.unregister()
+            self._scheduler_registered = False
+
     def update_settings(
         self,
         fps_target: int,
@@ -147,6 +226,14 @@ class LiveDetectionWorker:
             self.crime_threshold = crime_threshold
             self.show_boxes = show_boxes
             self.show_weapons = show_weapons
+            self.state_seq += 1
+        self.changes.notify()
+        self.pacer.set_target(fps_target)
+
+    def set_roi(self, polygons: Optional[List[List[Tuple[float, float]]]]) -> None:
+        """Restrict detection to ROI polygons (normalised [0, 1] x/y); None analyses the full frame."""
+        self.detector.set_roi(polygons)
+        self._state_changed()
 
     def change_video_source(self, new_source: str | int) -> bool:
         """Change video source dynamically (restart capture)."""
@@ -160,12 +247,16 @@ class LiveDetectionWorker:
             # Update source
             self.video_source = new_source
             self.source_type = self._detect_source_type(new_source)
+            self.encoder.default_quality = 60 if self._is_network_source() else 80
             
             # Reset stats
             self.frame_count = 0
             self.crime_count = 0
             self.frame_times.clear()
+            self.latencies.clear()
             self.connection_error_count = 0
+            self.pacer = FramePacer(self.fps_target)  # Processing cost differs per source
+            self._state_changed()
             
             # Restart if it was running
             if was_running:
@@ -178,58 +269,39 @@ class LiveDetectionWorker:
             print(f"❌ Error changing video source: {e}")
             return False
 
+    def _is_network_source(self) -> bool:
+        return self.source_type in ["ip_webcam", "rtsp", "http"]
+
     def _run(self) -> None:
-        """Main detection loop with error recovery."""
-        consecutive_failures = 0
-        max_consecutive_failures = 5
-        frame_skip_counter = 0
+        """Main detection loop: always analyses the newest captured frame, older ones are dropped."""
+        last_seq = 0
         
         # Adaptive settings based on source type
-        is_network_source = self.source_type in ["ip_webcam", "rtsp", "http"]
-        fps_target_local = 30
-        fps_target_network = 10  # Reduced FPS for wireless IP streams
-        effective_fps = fps_target_network if is_network_source else fps_target_local
-        
-        # Compression settings
-        quality_local = 80
-        quality_network = 60  # Higher compression for wireless
-        effective_quality = quality_network if is_network_source else quality_local
+        is_network_source = self._is_network_source()
         
-        print(f"🎥 Network source detected: {is_network_source} | FPS: {effective_fps} | Quality: {effective_quality}")
+        print(f"🎥 Network source detected: {is_network_source} | FPS target: {self.fps_target} | Quality: {self.encoder.default_quality}")
         
         while self._running:
-            if not self.capture:
+            grabber = self.grabber
+            if not grabber:
                 time.sleep(0.1)
                 continue
 
-            ret, frame = self.capture.read()
-            
-            # Handle read failures (network issues, EOF, etc.)
-            if not ret:
-                consecutive_failures += 1
-                if consecutive_failures > max_consecutive_failures:
-                    print(f"⚠️ Too many consecutive read failures. Stopping capture.")
+            captured = grabber.read_latest(last_seq, timeout=0.5)
+            if captured is None:
+                self.connection_error_count = grabber.consecutive_failures
+                if grabber.ended:
+                    # Source exhausted or too many read failures
                     self._running = False
+                    self._release_scheduler()
+                    self._state_changed()
                     break
-                
-                # Log read failure for streams
-                if self.source_type in ["rtsp", "http", "ip_webcam"]:
-                    print(f"⚠️ Read failure ({consecutive_failures}/{max_consecutive_failures}) - retrying...")
-                
-                time.sleep(0.1)
                 continue
-            
-            # Reset failure counter on successful read
-            consecutive_failures = 0
-            self.connection_error_count = 0
 
-            # Skip frames for network sources to reduce processing
-            if is_network_source:
-                frame_skip_counter += 1
-                if frame_skip_counter < 3:  # Process 1 out of every 3 frames from IP webcam
-                    time.sleep(0.03)
-                    continue
-                frame_skip_counter = 0
+            last_seq = captured.seq
+            frame = captured.frame
+            frame_start = time.perf_counter()
+            self.connection_error_count = 0
 
             # Get dynamic settings
             with self._lock:
@@ -237,119 +309,168 @@ class LiveDetectionWorker:
 
             self.frame_count += 1
             
-            # Reduce resolution for network sources before detection
+            # Reduce resolution for network sources before motion/clustering analysis;
+            # weapon inference still reads the original so it is not downscaled then upscaled again
+            inference_frame = frame
             if is_network_source:
                 h, w = frame.shape[:2]
                 if w > 320:  # Reduce resolution
                     scale = 320 / w
                     frame = cv2.resize(frame, (int(w * scale), int(h * scale)), interpolation=cv2.INTER_LINEAR)
             
-            results = self.detector.detect_frame(frame)
+            results = self.detector.detect_frame(frame, inference_frame=inference_frame)
             
-            # Use original frame with small status overlay
-            display_frame = frame.copy()
-
             is_crime = results["smoothed_score"] >= crime_threshold
-            
-            # Add small status text in top-right corner
-            status_text = "CRIME" if is_crime else "NORMAL"
-            status_color = (0, 0, 255) if is_crime else (0, 255, 0)  # Red for crime, Green for normal
-            cv2.putText(display_frame, status_text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 
-                       0.8, status_color, 2)
             if is_crime:
                 self.crime_count += 1
-                log_info = self.alert_logger.log_alert(frame=frame, detection_results=results, alert_type="CRIME")
-                if log_info and log_info.get("image_saved", False):
-                    alert_payload = {
-                        "alert_id": log_info.get("alert_id"),
-                        "threat_score": results["smoothed_score"],
-                        "confidence": results["confidence"],
-                        "timestamp": datetime.now().isoformat(),
-                        "weapons_count": len(results.get("weapons", [])),
-                        "source": self.source_type,
-                    }
-                    self._alerts_queue.put(alert_payload)
-
-            ret, buffer = cv2.imencode(".jpg", display_frame, [cv2.IMWRITE_JPEG_QUALITY, effective_quality])
-            if ret:
-                with self._lock:
-                    self.latest_frame_bytes = buffer.tobytes()
-                    self.latest_results = {
-                        "smoothed_score": results["smoothed_score"],
-                        "confidence": results["confidence"],
-                        "weapons_count": len(results.get("weapons", [])),
-                        "is_crime": is_crime,
-                        "source": self.source_type,
-                    }
-                    self.frame_times.append(time.time())
-
-            sleep_interval = max(0.0, (1.0 / max(1.0, effective_fps)) - 0.005)
-            time.sleep(sleep_interval)
-
-    def get_frame_base64(self) -> Optional[str]:
-        with self._lock:
-            if not self.latest_frame_bytes:
-                return None
-            encoded = base64.b64encode(self.latest_frame_bytes).decode("utf-8")
-            return f"data:image/jpeg;base64,{encoded}"
+                alert_payload = {
+                    "threat_score": results["smoothed_score"],
+                    "confidence": results["confidence"],
+                    "timestamp": datetime.now().isoformat(),
+                    "weapons_count": len(results.get("weapons", [])),
+                    "track_ids": results.get("track_ids", []),
+                    "source": self.source_type,
+                    "camera_id": self.camera_id,
+                }
+                # Announced from the writer once image and metadata exist, so clients can fetch them
+                self.alert_logger.log_alert(
+                    frame=frame, detection_results=results, alert_type="CRIME",
+                    on_written=lambda log_info, alert=alert_payload: self._publish_alert(log_info, alert),
+                )
+
+            # Publishing is just a reference swap; the status overlay is drawn at encode time
+            self.encoder.publish(frame, overlay=is_crime)
+            with self._lock:
+                self.latest_results = {
+                    "smoothed_score": results["smoothed_score"],
+                    "confidence": results["confidence"],
+                    "weapons_count": len(results.get("weapons", [])),
+                    "is_crime": is_crime,
+                    "source": self.source_type,
+                }
+                self.frame_times.append(time.time())
+                self.latencies.append(self.frame_times[-1] - captured.timestamp)
+                self.state_seq += 1
+            self.changes.notify()
+
+            # Closed-loop pacing: sleep only what is left of the frame budget, and let the
+            # grabber stop decoding frames the adapted rate will never analyse
+            pause = self.pacer.frame_done(time.perf_counter() - frame_start)
+            grabber.max_fps = self.pacer.rate
+            if pause > 0:
+                time.sleep(pause)
+
+    def _publish_alert(self, log_info: Dict[str, Any], alert: Dict[str, Any]) -> None:
+        """Fan an alert out to live clients once it has been written (with its image)."""
+        if not log_info.get("image_saved"):
+            return
+        self.alert_bus.publish({"alert_id": log_info.get("alert_id"), **alert}, camera_id=self.camera_id)
+
+    @staticmethod
+    def _render_display(frame, is_crime: bool):
+        """Original frame with a small status overlay (drawn on a copy)."""
+        display_frame = frame.copy()
+        # Add small status text in top-right corner
+        status_text = "CRIME" if is_crime else "NORMAL"
+        status_color = (0, 0, 255) if is_crime else (0, 255, 0)  # Red for crime, Green for normal
+        cv2.putText(display_frame, status_text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 
+                   0.8, status_color, 2)
+        return display_frame
+
+    def get_frame_base64(self, quality: Optional[int] = None) -> Optional[str]:
+        return self.encoder.get_base64(quality)
+
+    def get_frame_jpeg(self, quality: Optional[int] = None) -> Optional[Tuple[int, bytes]]:
+        """Latest frame as (sequence number, JPEG bytes), or None before the first frame."""
+        return self.encoder.get_jpeg(quality)
 
     def get_state(self) -> Dict[str, Any]:
+        roi_polygons = self.detector.state.roi_polygons
         with self._lock:
             fps = 0.0
             if len(self.frame_times) > 1:
                 fps = len(self.frame_times) / (self.frame_times[-1] - self.frame_times[0])
 
             return {
+                "seq": self.state_seq,
+                "frame_seq": self.encoder.seq,
                 "frame_count": self.frame_count,
                 "crime_count": self.crime_count,
                 "fps": round(fps, 2),
                 "latest_results": self.latest_results or {},
                 "running": self._running,
+                "camera_id": self.camera_id,
                 "video_source": str(self.video_source),
                 "source_type": self.source_type,
+                "fps_target": self.fps_target,
+                "pacing": self.pacer.get_stats(),
+                "encoding": self.encoder.get_stats(),
                 "connection_errors": self.connection_error_count,
+                "latency_ms": round(sum(self.latencies) / len(self.latencies) * 1000, 1) if self.latencies else None,
+                "capture": self.grabber.get_stats() if self.grabber else None,
+                "roi": [p.tolist() for p in roi_polygons] if roi_polygons else None,
+                "alert_writer": self.alert_logger.writer.get_stats() if self.alert_logger.writer else None,
             }
 
-    def flush_alerts(self) -> List[Dict[str, Any]]:
-        drained: List[Dict[str, Any]] = []
-        while not self._alerts_queue.empty():
-            try:
-                drained.append(self._alerts_queue.get_nowait())
-            except queue.Empty:  # pragma: no cover - race condition guard
-                break
-        return drained
-
     @property
     def running(self) -> bool:
         return self._running
 
 
-worker_singleton: Optional[LiveDetectionWorker] = None
-worker_dual_1: Optional[LiveDetectionWorker] = None
-worker_dual_2: Optional[LiveDetectionWorker] = None
-
-DUAL_CAMERA_1_SOURCE: str | int = 0  # First webcam
-DUAL_CAMERA_2_SOURCE: str | int = "http://100.76.107.130:8080/video"  # IP webcam URL
-
-def get_worker() -> LiveDetectionWorker:
-    global worker_singleton
-    if worker_singleton is None:
-        worker_singleton = LiveDetectionWorker(
-            video_source=0  # Default to webcam 0; change to URL/file when you want a different source
-        )
-        # Don't auto-start; let the client explicitly start via /live/control
-    return worker_singleton
-
-def get_worker_dual_1() -> LiveDetectionWorker:
-    """Get or create first worker for dual-camera mode."""
-    global worker_dual_1
-    if worker_dual_1 is None:
-        worker_dual_1 = LiveDetectionWorker(video_source=DUAL_CAMERA_1_SOURCE)
-    return worker_dual_1
-
-def get_worker_dual_2() -> LiveDetectionWorker:
-    """Get or create second worker for dual-camera mode."""
-    global worker_dual_2
-    if worker_dual_2 is None:
-        worker_dual_2 = LiveDetectionWorker(video_source=DUAL_CAMERA_2_SOURCE)
-    return worker_dual_2
+detection_engine: Optional[DetectionEngine] = None
+stage_executor: Optional[StageExecutor] = None
+alert_writer: Optional[AlertWriter] = None
+# Workers and request handlers may ask for these at the same time; each is created exactly once
+_engine_lock = threading.Lock()
+_executor_lock = threading.Lock()
+_writer_lock = threading.Lock()
+
+# FP32 model or a prepared artifact from prepare_model.py (e.g. models/normal.opt.ort)
+GUN_MODEL_PATH = os.getenv("GUN_MODEL_PATH", "normal.onnx")
+
+INFERENCE_MAX_BATCH = 8
+INFERENCE_MAX_WAIT_MS = 10.0
+
+# Weapon inference, optical flow and clustering run side by side; each gets a share of the cores
+PARALLEL_STAGES = True
+THREAD_BUDGET = default_thread_budget(parallel_stages=3)
+
+ALERT_DIR = "alerts"
+
+# Alert persistence queue shared by all cameras; a full queue drops alerts instead of stalling detection
+ALERT_QUEUE_SIZE = int(os.getenv("ALERT_QUEUE_SIZE", "256"))
+ALERT_FSYNC = os.getenv("ALERT_FSYNC", "1") not in ("0", "false", "False")
+
+def get_detection_engine() -> DetectionEngine:
+    """Get the weapon model shared by all cameras (loaded once, inference batched across cameras)."""
+    global detection_engine
+    with _engine_lock:
+        if detection_engine is None:
+            engine = get_shared_engine(
+                GUN_MODEL_PATH,
+                intra_op_threads=THREAD_BUDGET["ort_intra_op_threads"],
+            )
+            engine.enable_batching(INFERENCE_MAX_BATCH, INFERENCE_MAX_WAIT_MS)
+            detection_engine = engine
+        return detection_engine
+
+def get_stage_executor() -> Optional[StageExecutor]:
+    """Get or create the stage thread pool shared by all cameras (None when disabled)."""
+    global stage_executor
+    with _executor_lock:
+        if PARALLEL_STAGES and stage_executor is None:
+            stage_executor = StageExecutor(
+                max_workers=THREAD_BUDGET["stage_workers"],
+                opencv_threads=THREAD_BUDGET["opencv_threads"],
+            )
+        return stage_executor
+
+def get_alert_writer() -> AlertWriter:
+    """Get or create the alert writer thread shared by all cameras (one writer serialises daily logs)."""
+    global alert_writer
+    with _writer_lock:
+        if alert_writer is None:
+            # Legacy JSON-array logs are converted before the writer starts appending to that day
+            migrate_daily_logs(Path(ALERT_DIR) / "daily_logs")
+            alert_writer = AlertWriter(max_queue=ALERT_QUEUE_SIZE, fsync=ALERT_FSYNC)
+        return alert_writer
@@ -0,0 +1,259 @@
+"""WebSocket push of live frames, stats deltas and alerts, with per-subscriber backpressure."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from typing import Any, Dict, Iterable, Optional, Set
+
+from fastapi import WebSocket, WebSocketDisconnect
+from starlette.concurrency import run_in_threadpool
+
+from backend.alert_bus import AlertBus
+from backend.camera_registry import CameraRegistry
+from backend.live_detection import LiveDetectionWorker
+
+CHANNELS = ("frames", "stats", "alerts")
+DEFAULT_FRAME_FPS = 15
+MAX_FRAME_FPS = 30
+
+
+class Subscription:
+    """What one client wants from one camera, and what it has already been sent."""
+
+    __slots__ = ("worker", "channels", "fps", "quality", "frame_seq", "next_frame", "stats", "stats_seq",
+                 "next_stats", "alert_seq")
+
+    def __init__(self, worker: LiveDetectionWorker, channels: Set[str], fps: float, quality: Optional[int],
+                 alert_seq: int):
+        self.worker = worker
+        self.channels = channels
+        self.fps = fps
+        self.quality = quality
+        self.frame_seq = 0
+        self.next_frame = 0.0
+        self.stats: Dict[str, Any] = {}  # Last stats sent, for deltas
+        self.stats_seq: Optional[int] = None  # worker.state_seq of those stats
+        self.next_stats = 0.0
+        self.alert_seq = alert_seq  # Cursor into the alert bus
+
+
+class LiveSubscriber:
+    """
+    One WebSocket client subscribed to a set of cameras and channels.
+
+    Nothing is queued per client: the sender has at most one message in flight and, once the
+    socket accepts it, builds the next one from the newest state. Between sends it sleeps until
+    a subscribed worker or the alert bus signals a change (or a rate-capped send falls due). A slow client therefore
+    gets fewer frames (never stale ones), stats deltas are computed against what it was last
+    sent, and alerts are read through a per-camera cursor over the shared alert bus.
+
+    Client messages:
+        {"action": "subscribe", "cameras": ["default"], "channels": ["frames", "stats", "alerts"],
+         "fps": 15, "quality": 60}
+        {"action": "unsubscribe", "cameras": ["default"]}
+    Server messages have a "type" of frame, stats, alert, subscribed, unsubscribed or error.
+    """
+
+    def __init__(self, websocket: WebSocket, registry: CameraRegistry, alert_bus: AlertBus,
+                 stats_interval: float = 1.0):
+        """
+        Args:
+            websocket: Accepted WebSocket
+            registry: Camera registry to resolve camera ids against
+            alert_bus: Bus the workers publish alerts to
+            stats_interval: Seconds between stats snapshots per camera
+        """
+        self.websocket = websocket
+        self.registry = registry
+        self.alert_bus = alert_bus
+        self.stats_interval = stats_interval
+        self.subscriptions: Dict[str, Subscription] = {}
+        self._send_lock = asyncio.Lock()
+        self._wake = asyncio.Event()  # Set by subscribed workers, the alert bus and (un)subscribes
+
+        # Statistics
+        self.frames_sent = 0
+        self.frames_skipped = 0  # Published frames this client never got (rate cap or slow socket)
+        self.alerts_missed = 0  # Alerts that left the bus before this client read them
+
+    async def run(self) -> None:
+        """Serve the connection until the client disconnects."""
+        self.alert_bus.add_waiter(self._wake)
+        sender = asyncio.create_task(self._send_loop())
+        try:
+            while True:
+                text = await self.websocket.receive_text()
+                try:
+                    message = json.loads(text)
+                except json.JSONDecodeError:
+                    # Keep the connection: a bad message is answered, not fatal
+                    await self._send({"type": "error", "detail": "Expected a JSON object"})
+                    continue
+                await self._handle(message)
+        except WebSocketDisconnect:
+            pass
+        finally:
+            sender.cancel()
+            try:
+                await sender
+            except (asyncio.CancelledError, WebSocketDisconnect, RuntimeError):
+                pass
+            self.alert_bus.remove_waiter(self._wake)
+            for camera_id in list(self.subscriptions):
+                self._drop(camera_id)
+
+    async def _send(self, payload: Dict[str, Any]) -> None:
+        async with self._send_lock:
+            await self.websocket.send_json(payload)
+
+    async def _handle(self, message: Any) -> None:
+        if not isinstance(message, dict):
+            await self._send({"type": "error", "detail": "Expected a JSON object"})
+            return
+
+        action = message.get("action")
+        cameras = message.get("cameras") or []
+        if not isinstance(cameras, list):
+            await self._send({"type": "error", "detail": "cameras must be a list"})
+            return
+        cameras = [str(camera_id) for camera_id in cameras]
+
+        if action == "unsubscribe":
+            for camera_id in cameras:
+                self._drop(camera_id)
+            await self._send({"type": "unsubscribed", "cameras": cameras})
+        elif action == "subscribe":
+            try:
+                await self._send(self._subscribe(cameras, message))
+            except ValueError as e:
+                await self._send({"type": "error", "detail": str(e)})
+        else:
+            await self._send({"type": "error", "detail": f"Unknown action: {action}"})
+
+    def _subscribe(self, cameras: Iterable[str], message: Dict[str, Any]) -> Dict[str, Any]:
+        """Add or replace subscriptions; returns the acknowledgement message.
+
+        Raises:
+            ValueError: If a channel is unknown or fps/quality are not numbers
+        """
+        channels = set(message.get("channels") or CHANNELS)
+        unknown_channels = channels - set(CHANNELS)
+        if unknown_channels:
+            raise ValueError(f"Unknown channels: {sorted(unknown_channels)}")
+        try:
+            fps = min(MAX_FRAME_FPS, max(0.1, float(message.get("fps") or DEFAULT_FRAME_FPS)))
+            quality = message.get("quality")
+            quality = min(95, max(10, int(quality))) if quality is not None else None
+        except (TypeError, ValueError):
+            raise ValueError("fps and quality must be numbers")
+
+        subscribed, unknown = [], []
+        for camera_id in cameras:
+            worker = self.registry.get(camera_id)
+            if worker is None:
+                unknown.append(camera_id)
+                continue
+            previous = self.subscriptions.get(camera_id)
+            # Only alerts raised from now on (or since the previous subscription) are pushed
+            alert_seq = previous.alert_seq if previous else self.alert_bus.last_id
+            if previous and previous.worker is not worker:
+                previous.worker.changes.remove_waiter(self._wake)
+            worker.changes.add_waiter(self._wake)
+            self.subscriptions[camera_id] = Subscription(worker, channels, fps, quality, alert_seq)
+            subscribed.append(camera_id)
+
+        self._wake.set()  # Send the first frame and stats now
+        return {"type": "subscribed", "cameras": subscribed, "unknown": unknown, "channels": sorted(channels)}
+
+    def _drop(self, camera_id: str) -> None:
+        subscription = self.subscriptions.pop(camera_id, None)
+        if subscription is not None:
+            subscription.worker.changes.remove_waiter(self._wake)
+
+    def _next_due(self, now: float) -> float:
+        """Seconds until a change that is waiting on a rate limit may be sent (at most stats_interval)."""
+        due = self.stats_interval
+        for subscription in self.subscriptions.values():
+            worker = subscription.worker
+            if "frames" in subscription.channels and worker.encoder.seq != subscription.frame_seq:
+                due = min(due, subscription.next_frame - now)
+            if "stats" in subscription.channels and worker.state_seq != subscription.stats_seq:
+                due = min(due, subscription.next_stats - now)
+        return max(0.0, due)
+
+    async def _send_loop(self) -> None:
+        """Push whatever is new for every subscription; otherwise wait to be woken."""
+        while True:
+            self._wake.clear()
+            sent = False
+            for camera_id, subscription in list(self.subscriptions.items()):
+                worker = self.registry.get(camera_id)
+                if worker is not subscription.worker:
+                    # Removed (or removed and re-added): the subscription's cursors no longer apply
+                    if self.subscriptions.get(camera_id) is subscription:
+                        self._drop(camera_id)
+                    await self._send({"type": "error", "camera_id": camera_id, "detail": "Camera removed"})
+                    continue
+                # Alerts first: they are the one thing a client must not miss
+                if "alerts" in subscription.channels:
+                    sent |= await self._push_alerts(camera_id, subscription)
+                if "stats" in subscription.channels:
+                    sent |= await self._push_stats(camera_id, worker, subscription)
+                if "frames" in subscription.channels:
+                    sent |= await self._push_frame(camera_id, worker, subscription)
+            if sent:
+                continue
+            try:
+                await asyncio.wait_for(self._wake.wait(), self._next_due(time.monotonic()))
+            except asyncio.TimeoutError:
+                pass
+
+    async def _push_alerts(self, camera_id: str, subscription: Subscription) -> bool:
+        read = self.alert_bus.read(subscription.alert_seq, camera_id)
+        subscription.alert_seq = read.cursor
+        self.alerts_missed += read.missed
+        for event in read.events:
+            await self._send({"type": "alert", "camera_id": camera_id, "seq": event.id, "alert": event.alert})
+        return bool(read.events)
+
+    async def _push_stats(self, camera_id: str, worker: LiveDetectionWorker, subscription: Subscription) -> bool:
+        now = time.monotonic()
+        if now < subscription.next_stats or worker.state_seq == subscription.stats_seq:
+            return False
+        subscription.next_stats = now + self.stats_interval
+
+        state = worker.get_state()
+        subscription.stats_seq = state["seq"]
+        changes = {
+            key: value for key, value in state.items()
+            if key not in subscription.stats or subscription.stats[key] != value
+        }
+        if not changes:
+            return False
+        full = not subscription.stats
+        subscription.stats = state
+        await self._send({"type": "stats", "camera_id": camera_id, "full": full, "changes": changes})
+        return True
+
+    async def _push_frame(self, camera_id: str, worker: LiveDetectionWorker, subscription: Subscription) -> bool:
+        now = time.monotonic()
+        if worker.encoder.seq == subscription.frame_seq or now < subscription.next_frame:
+            return False
+
+        # Encoding is shared with every other viewer of this frame and runs off the event loop
+        encoded = await run_in_threadpool(worker.encoder.get_data_uri, subscription.quality)
+        if encoded is None:
+            return False
+        seq, frame = encoded
+        if subscription.frame_seq:
+            self.frames_skipped += max(0, seq - subscription.frame_seq - 1)
+        subscription.frame_seq = seq
+        # Stay on the client's rate grid, but don't burst to catch up after a slow send
+        interval = 1.0 / subscription.fps
+        late = now - subscription.next_frame >= interval
+        subscription.next_frame = now + interval if late else subscription.next_frame + interval
+        await self._send({"type": "frame", "camera_id": camera_id, "seq": seq, "frame": frame})
+        self.frames_sent += 1
+        return True
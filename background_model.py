@@ -0,0 +1,99 @@
+"""
+Incremental Background Model for CCTV Person-Region Extraction
+Per-camera MOG2/KNN or running-average model maintained at reduced resolution and update rate
+"""
+
+from typing import Optional
+
+import cv2
+import numpy as np
+
+
+BACKGROUND_METHODS = ("mog2", "knn", "running_avg")
+
+
+class BackgroundModel:
+    """Foreground extraction against a background learned incrementally from one camera."""
+
+    def __init__(self, method: str = "mog2", working_width: int = 320, update_interval: int = 2,
+                 warmup_frames: int = 10, learning_rate: float = 0.01, diff_threshold: int = 25):
+        """
+        Args:
+            method: "mog2", "knn" or "running_avg" (pure NumPy/accumulateWeighted)
+            working_width: Width frames are downscaled to before modelling
+            update_interval: Learn from every Nth frame only; other frames are classified with a frozen model
+            warmup_frames: Learning updates before the foreground is trusted
+            learning_rate: Background adaptation rate per update
+            diff_threshold: Gray-level difference counted as foreground (running_avg only)
+        """
+        if method not in BACKGROUND_METHODS:
+            raise ValueError(f"Unknown background method: {method} (choose from {', '.join(BACKGROUND_METHODS)})")
+        self.method = method
+        self.working_width = working_width
+        self.update_interval = max(1, int(update_interval))
+        self.warmup_frames = warmup_frames
+        self.learning_rate = learning_rate
+        self.diff_threshold = diff_threshold
+
+        self._kernel_open = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
+        self._kernel_close = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (7, 7))
+        self.reset()
+
+    def reset(self) -> None:
+        """Start learning from scratch (source or resolution change)."""
+        if self.method == "mog2":
+            self._subtractor = cv2.createBackgroundSubtractorMOG2(detectShadows=False)
+        elif self.method == "knn":
+            self._subtractor = cv2.createBackgroundSubtractorKNN(detectShadows=False)
+        else:
+            self._subtractor = None
+        self._background: Optional[np.ndarray] = None
+        self._shape = None
+        self.frames_seen = 0
+        self.updates = 0
+
+    def working_scale(self, width: int) -> float:
+        """Scale factor from full to working resolution (never upscales)."""
+        if not self.working_width or width <= self.working_width:
+            return 1.0
+        return self.working_width / width
+
+    @property
+    def ready(self) -> bool:
+        return self.updates >= self.warmup_frames
+
+    def apply(self, gray: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Classify a working-resolution gray frame and (every update_interval frames) learn from it.
+
+        Returns:
+            uint8 foreground mask (255 = foreground), or None while the model is warming up
+        """
+        if self._shape != gray.shape:
+            self.reset()
+            self._shape = gray.shape
+
+        learn = self.frames_seen % self.update_interval == 0
+        self.frames_seen += 1
+
+        if self._subtractor is not None:
+            # learningRate=0 classifies against the frozen model without updating it
+            rate = self.learning_rate if learn else 0.0
+            foreground = self._subtractor.apply(gray, learningRate=rate)
+        else:
+            if self._background is None:
+                self._background = gray.astype(np.float32)
+            diff = cv2.absdiff(gray, cv2.convertScaleAbs(self._background))
+            _, foreground = cv2.threshold(diff, self.diff_threshold, 255, cv2.THRESH_BINARY)
+            if learn:
+                cv2.accumulateWeighted(gray, self._background, self.learning_rate)
+
+        if learn:
+            self.updates += 1
+        if not self.ready:
+            return None
+
+        # Remove speckle, then merge body parts into one blob per person
+        foreground = cv2.morphologyEx(foreground, cv2.MORPH_OPEN, self._kernel_open)
+        foreground = cv2.morphologyEx(foreground, cv2.MORPH_CLOSE, self._kernel_close)
+        return foreground
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Person-Clustering Benchmark
+Compares the old nested-loop neighbor count with the vectorized matrix and grid-hash versions
+
+Usage:
+    python benchmark_clustering.py [--sizes 10 50 200 1000 5000] [--radius 100]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from cctv_detector import count_neighbors, count_neighbors_grid, count_neighbors_matrix
+
+
+def count_neighbors_loop(points: np.ndarray, radius: float) -> np.ndarray:
+    """Reference: the original O(n²) Python loop from detect_person_clustering."""
+    counts = np.zeros(len(points), dtype=np.int64)
+    for i, (x1, y1) in enumerate(points):
+        neighbors = 0
+        for j, (x2, y2) in enumerate(points):
+            if i != j:
+                dist = np.sqrt((x1-x2)**2 + (y1-y2)**2)
+                if dist < radius:
+                    neighbors += 1
+        counts[i] = neighbors
+    return counts
+
+
+def time_ms(fn, points: np.ndarray, radius: float, repeats: int) -> float:
+    """Best-of-N wall time in milliseconds."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(points, radius)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark person-clustering neighbor counting")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 200, 500, 1000, 5000])
+    parser.add_argument("--radius", type=float, default=100.0)
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--loop-max", type=int, default=1000, help="Skip the slow loop above this many regions")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+
+    print("=" * 78)
+    print("📊 PERSON CLUSTERING BENCHMARK (ms, best of %d)" % args.repeats)
+    print("=" * 78)
+    print(f"{'regions':>8} {'loop':>12} {'matrix':>12} {'grid':>12} {'adaptive':>12}  match")
+
+    for n in args.sizes:
+        points = np.column_stack([
+            rng.integers(0, args.width, n),
+            rng.integers(0, args.height, n),
+        ]).astype(np.float64)
+
+        expected = count_neighbors_matrix(points, args.radius)
+        match = np.array_equal(expected, count_neighbors_grid(points, args.radius))
+
+        if n <= args.loop_max:
+            loop_ms = time_ms(count_neighbors_loop, points, args.radius, 1)
+            loop_col = f"{loop_ms:12.2f}"
+            match = match and np.array_equal(expected, count_neighbors_loop(points, args.radius))
+        else:
+            loop_col = f"{'skipped':>12}"
+
+        matrix_ms = time_ms(count_neighbors_matrix, points, args.radius, args.repeats)
+        grid_ms = time_ms(count_neighbors_grid, points, args.radius, args.repeats)
+        adaptive_ms = time_ms(count_neighbors, points, args.radius, args.repeats)
+
+        print(f"{n:>8} {loop_col} {matrix_ms:12.2f} {grid_ms:12.2f} {adaptive_ms:12.2f}  {'✅' if match else '❌'}")
+
+
+if __name__ == "__main__":
+    main()
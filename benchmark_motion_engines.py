@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Motion Engine Benchmark
+Reports ms/frame for every motion engine and how well it agrees with full-resolution Farneback
+
+Usage:
+    python benchmark_motion_engines.py                       # synthetic clip
+    python benchmark_motion_engines.py clip1.mp4 clip2.mp4 --width 320 --frames 300
+"""
+
+import argparse
+import time
+from typing import List
+
+import cv2
+import numpy as np
+
+from motion_engines import MOTION_ENGINES, create_motion_engine, motion_regions_from_mask
+
+
+def synthetic_clip(frames: int = 120, width: int = 1280, height: int = 720) -> List[np.ndarray]:
+    """Textured background with a few moving blobs (stands in when no clip is given)."""
+    rng = np.random.default_rng(0)
+    background = cv2.GaussianBlur((rng.random((height, width, 3)) * 255).astype(np.uint8), (7, 7), 0)
+    clip = []
+    for i in range(frames):
+        frame = background.copy()
+        cv2.rectangle(frame, (100 + i * 18 % (width - 300), 200), (260 + i * 18 % (width - 300), 460), (40, 40, 40), -1)
+        cv2.circle(frame, (width - 200, 100 + i * 9 % (height - 200)), 60, (220, 220, 220), -1)
+        if (i // 20) % 2:
+            cv2.rectangle(frame, (600, 500), (700, 650), (0, 0, 255), -1)  # Blinking object
+        clip.append(frame)
+    return clip
+
+
+def load_clip(path: str, max_frames: int) -> List[np.ndarray]:
+    capture = cv2.VideoCapture(path)
+    clip = []
+    while len(clip) < max_frames:
+        ret, frame = capture.read()
+        if not ret:
+            break
+        clip.append(frame)
+    capture.release()
+    return clip
+
+
+def blurred_gray(frame: np.ndarray) -> np.ndarray:
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    return cv2.GaussianBlur(gray, (5, 5), 0)
+
+
+def run_engine(name: str, grays: List[np.ndarray], working_width):
+    """Run one engine over a clip; returns (ms per frame, full-res masks, motion scores)."""
+    engine = create_motion_engine(name, working_width)
+    h, w = grays[0].shape[:2]
+    scale = engine.working_scale(w)
+    size = (max(1, int(round(w * scale))), max(1, int(round(h * scale))))
+    inputs = [g if scale >= 1.0 else cv2.resize(g, size, interpolation=cv2.INTER_AREA) for g in grays]
+
+    masks, scores = [], []
+    elapsed = 0.0
+    for prev, curr in zip(inputs, inputs[1:]):
+        start = time.perf_counter()
+        mask = engine.motion_mask(prev, curr, scale)
+        score, _ = motion_regions_from_mask(mask, scale)
+        elapsed += time.perf_counter() - start
+
+        full = mask if scale >= 1.0 else cv2.resize(mask.astype(np.uint8), (w, h), interpolation=cv2.INTER_NEAREST)
+        masks.append(full.astype(bool))
+        scores.append(score)
+
+    return elapsed / max(1, len(inputs) - 1) * 1000, masks, scores
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark motion engines against Farneback")
+    parser.add_argument("clips", nargs="*", help="Video files (default: synthetic clip)")
+    parser.add_argument("--width", type=int, default=320, help="Working width for the reduced-resolution runs")
+    parser.add_argument("--frames", type=int, default=200, help="Frames read per clip")
+    args = parser.parse_args()
+
+    clips = [(path, load_clip(path, args.frames)) for path in args.clips] or [("synthetic", synthetic_clip())]
+
+    for label, clip in clips:
+        if len(clip) < 2:
+            print(f"⚠️ {label}: not enough frames")
+            continue
+
+        grays = [blurred_gray(f) for f in clip]
+        h, w = grays[0].shape[:2]
+
+        print("=" * 78)
+        print(f"🎬 {label}: {len(clip)} frames at {w}x{h}")
+        print("=" * 78)
+        print(f"{'engine':<16} {'width':>6} {'ms/frame':>10} {'mask IoU':>10} {'score MAE':>10} {'flag agree':>11}")
+
+        ref_ms, ref_masks, ref_scores = run_engine("farneback", grays, None)
+        print(f"{'farneback':<16} {w:>6} {ref_ms:>10.2f} {'(ref)':>10} {'(ref)':>10} {'(ref)':>11}")
+
+        for name in MOTION_ENGINES:
+            for working_width in (None, args.width):
+                if name == "farneback" and working_width is None:
+                    continue
+                ms, masks, scores = run_engine(name, grays, working_width)
+
+                ious = []
+                for a, b in zip(ref_masks, masks):
+                    union = np.count_nonzero(a | b)
+                    if union:
+                        ious.append(np.count_nonzero(a & b) / union)
+                iou = float(np.mean(ious)) if ious else 1.0
+                mae = float(np.mean(np.abs(np.array(ref_scores) - np.array(scores))))
+                # detect_frame only uses motion above 0.5 for the crime score
+                agree = float(np.mean((np.array(ref_scores) > 0.5) == (np.array(scores) > 0.5)))
+
+                shown = working_width if working_width and working_width < w else w
+                print(f"{name:<16} {shown:>6} {ms:>10.2f} {iou:>10.3f} {mae:>10.3f} {agree:>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
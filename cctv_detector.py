@@ -7,48 +7,416 @@ import os
 import cv2
 import numpy as np
 from collections import deque, defaultdict
+import threading
 import time
 from typing import Tuple, List, Dict, Optional
 import onnxruntime as rt
 
+from frame_features import FrameFeatures
+from motion_engines import create_motion_engine, motion_regions_from_mask
+from background_model import BACKGROUND_METHODS, BackgroundModel
+from object_tracker import WeaponTracker
+from inference_scheduler import BatchInferenceScheduler
 
-class CCTVCrimeDetector:
-    """Optimized detector specifically for CCTV surveillance footage."""
+
+def create_session_options(gun_model_path: str, intra_op_threads: int = 0) -> rt.SessionOptions:
+    """Tuned ONNX Runtime session options for the gun model (intra_op_threads=0 keeps ORT's default)."""
+    options = rt.SessionOptions()
+    options.execution_mode = rt.ExecutionMode.ORT_SEQUENTIAL
+    options.inter_op_num_threads = 1
+    if intra_op_threads > 0:
+        options.intra_op_num_threads = intra_op_threads
+    
+    # Artifacts from prepare_model.py are already graph-optimized; skip re-optimizing at startup
+    if gun_model_path.endswith(".ort"):
+        options.graph_optimization_level = rt.GraphOptimizationLevel.ORT_DISABLE_ALL
+    else:
+        options.graph_optimization_level = rt.GraphOptimizationLevel.ORT_ENABLE_ALL
+    return options
+
+
+def load_gun_model(gun_model_path: str = "normal.onnx", use_gpu: bool = True,
+                   intra_op_threads: int = 0) -> Tuple[Optional[rt.InferenceSession], str]:
+    """
+    Load the ONNX gun model on the best available provider.
     
-    def __init__(self, gun_model_path: str = "normal.onnx", use_gpu: bool = True):
-        """Initialize CCTV-optimized detector."""
+    Accepts the FP32 model or an artifact from prepare_model.py (optimized .ort, INT8 .onnx).
+    """
+    options = create_session_options(gun_model_path, intra_op_threads)
+    
+    providers = []
+    if use_gpu:
+        if 'CoreMLExecutionProvider' in rt.get_available_providers():
+            providers.append('CoreMLExecutionProvider')
+        elif 'CUDAExecutionProvider' in rt.get_available_providers():
+            providers.append('CUDAExecutionProvider')
+    providers.append('CPUExecutionProvider')
+    
+    try:
+        session = rt.InferenceSession(gun_model_path, sess_options=options, providers=providers)
+        device = "GPU (Metal)" if 'CoreMLExecutionProvider' in providers else \
+                 "GPU (CUDA)" if 'CUDAExecutionProvider' in providers else "CPU"
+    except Exception as e:
+        print(f"⚠️ ONNX model failed: {e}")
+        session = None
+        device = "CPU"
+    
+    return session, device
+
+
+# Compact per-detection record produced by the vectorized decoder
+WEAPON_DTYPE = np.dtype([
+    ('x1', np.int32), ('y1', np.int32), ('x2', np.int32), ('y2', np.int32),
+    ('confidence', np.float32),
+])
+
+
+def box_iou(box: np.ndarray, boxes: np.ndarray) -> np.ndarray:
+    """IoU between one [x1, y1, x2, y2] box and an (N, 4) array of boxes."""
+    xx1 = np.maximum(box[0], boxes[:, 0])
+    yy1 = np.maximum(box[1], boxes[:, 1])
+    xx2 = np.minimum(box[2], boxes[:, 2])
+    yy2 = np.minimum(box[3], boxes[:, 3])
+    inter = np.clip(xx2 - xx1, 0, None) * np.clip(yy2 - yy1, 0, None)
+    area = (box[2] - box[0]) * (box[3] - box[1])
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    return inter / (area + areas - inter + 1e-6)
+
+
+def non_max_suppression(boxes: np.ndarray, scores: np.ndarray, iou_threshold: float = 0.45) -> np.ndarray:
+    """
+    Greedy NMS with vectorized IoU.
+    
+    Args:
+        boxes: (N, 4) array of [x1, y1, x2, y2]
+        scores: (N,) confidence scores
+        iou_threshold: Boxes overlapping a kept box above this IoU are dropped
         
-        # ONNX model for gun detection
-        providers = []
-        if use_gpu:
-            if 'CoreMLExecutionProvider' in rt.get_available_providers():
-                providers.append('CoreMLExecutionProvider')
-            elif 'CUDAExecutionProvider' in rt.get_available_providers():
-                providers.append('CUDAExecutionProvider')
-        providers.append('CPUExecutionProvider')
+    Returns:
+        Indices of kept boxes, highest score first
+    """
+    if len(boxes) == 0:
+        return np.empty(0, dtype=np.int64)
+    
+    boxes = boxes.astype(np.float32, copy=False)
+    order = np.argsort(-scores, kind='stable')
+    keep = []
+    # Python only loops over surviving boxes; each step suppresses a whole slice at once
+    while order.size > 0:
+        i = order[0]
+        keep.append(i)
+        if order.size == 1:
+            break
+        ious = box_iou(boxes[i], boxes[order[1:]])
+        order = order[1:][ious <= iou_threshold]
+    
+    return np.asarray(keep, dtype=np.int64)
+
+
+def weapons_to_dicts(weapons: np.ndarray) -> List[Dict]:
+    """Convert a WEAPON_DTYPE array to the detection dicts used in results."""
+    return [
+        {
+            'box': (int(w['x1']), int(w['y1']), int(w['x2']), int(w['y2'])),
+            'confidence': float(w['confidence']),
+            'class': 'weapon'
+        }
+        for w in weapons
+    ]
+
+
+def count_neighbors_matrix(points: np.ndarray, radius: float) -> np.ndarray:
+    """Neighbors within radius for each point, from a full vectorized distance matrix (small n)."""
+    diff = points[:, None, :] - points[None, :, :]
+    d2 = np.einsum('ijk,ijk->ij', diff, diff)
+    return np.count_nonzero(d2 < radius * radius, axis=1) - 1  # Minus self
+
+
+def count_neighbors_grid(points: np.ndarray, radius: float) -> np.ndarray:
+    """Neighbors within radius for each point, using a uniform grid hash with radius-sized cells."""
+    n = len(points)
+    cells = np.floor_divide(points, radius).astype(np.int64)
+    
+    # Bucket point indices by cell
+    order = np.lexsort((cells[:, 1], cells[:, 0]))
+    sorted_cells = cells[order]
+    keys, starts, counts = np.unique(sorted_cells, axis=0, return_index=True, return_counts=True)
+    buckets = {
+        (int(cx), int(cy)): order[start:start + count]
+        for (cx, cy), start, count in zip(keys, starts, counts)
+    }
+    
+    # Each cell only compares against itself and its 8 neighbouring cells
+    neighbors = np.zeros(n, dtype=np.int64)
+    r2 = radius * radius
+    for (cx, cy), idx in buckets.items():
+        cand = np.concatenate([
+            buckets[key] for key in (
+                (cx + dx, cy + dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)
+            ) if key in buckets
+        ])
+        diff = points[idx, None, :] - points[None, cand, :]
+        d2 = np.einsum('ijk,ijk->ij', diff, diff)
+        neighbors[idx] = np.count_nonzero(d2 < r2, axis=1) - 1  # Minus self
+    
+    return neighbors
+
+
+def count_neighbors(points: np.ndarray, radius: float, matrix_max: int = 512) -> np.ndarray:
+    """
+    Count, for every point, how many other points lie strictly within radius.
+    
+    Args:
+        points: (N, 2) array of x, y centers
+        radius: Proximity distance
+        matrix_max: Up to this many points a dense distance matrix is cheapest; above it a grid hash is used
         
-        try:
-            self.session = rt.InferenceSession(gun_model_path, providers=providers)
-            self.device = "GPU (Metal)" if 'CoreMLExecutionProvider' in providers else \
-                         "GPU (CUDA)" if 'CUDAExecutionProvider' in providers else "CPU"
-        except Exception as e:
-            print(f"⚠️ ONNX model failed: {e}")
-            self.session = None
-            self.device = "CPU"
+    Returns:
+        (N,) array of neighbor counts
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    if len(points) == 0:
+        return np.zeros(0, dtype=np.int64)
+    if len(points) <= matrix_max:
+        return count_neighbors_matrix(points, radius)
+    return count_neighbors_grid(points, radius)
+
+
+def tile_origins(length: int, tile: int, overlap: int) -> List[int]:
+    """Start positions of evenly spread tiles covering length with at least overlap pixels shared."""
+    if length <= tile:
+        return [0]
+    count = int(np.ceil((length - overlap) / (tile - overlap)))
+    return np.linspace(0, length - tile, count).round().astype(int).tolist()
+
+
+def parse_roi_polygons(polygons: List[List[Tuple[float, float]]]) -> List[np.ndarray]:
+    """
+    Check ROI polygons in normalised (x, y) coordinates and return them as float arrays.
+    
+    Raises:
+        ValueError: If a polygon has fewer than 3 points, coordinates outside [0, 1], or no area
+    """
+    parsed = []
+    for polygon in polygons:
+        pts = np.asarray(polygon, dtype=np.float64)
+        if pts.ndim != 2 or pts.shape[1] != 2 or len(pts) < 3:
+            raise ValueError("ROI polygons need at least 3 (x, y) points")
+        if pts.min() < 0.0 or pts.max() > 1.0:
+            raise ValueError("ROI coordinates must be normalised to [0, 1]")
+        # A zero-width/height bounding box (or collinear points) crops to a line of pixels
+        x, y = pts[:, 0], pts[:, 1]
+        area = 0.5 * abs(np.dot(x, np.roll(y, 1)) - np.dot(y, np.roll(x, 1)))
+        if np.ptp(x) <= 0.0 or np.ptp(y) <= 0.0 or area <= 0.0:
+            raise ValueError("ROI polygons must enclose an area")
+        parsed.append(pts)
+    return parsed
+
+
+class LetterboxPreprocessor:
+    """Letterboxes frames into preallocated model-input buffers (one instance per camera)."""
+    
+    def __init__(self, size: int = 640, pad_value: int = 114):
+        self.size = size
+        self.pad_value = pad_value
         
-        self.input_name = self.session.get_inputs()[0].name if self.session else None
-        self.output_name = self.session.get_outputs()[0].name if self.session else None
+        # Reused every frame: uint8 letterbox canvas and the float32 NCHW model input
+        # (allocated on first use, so cameras that never run cost nothing)
+        self.canvas: Optional[np.ndarray] = None
+        self.tensor: Optional[np.ndarray] = None
         
-        # CCTV-specific settings
-        self.cctv_gun_confidence = 0.35  # More sensitive for CCTV
-        self.cctv_weapon_size_min = 15   # Lower min size
-        self.cctv_weapon_size_max = 600  # Higher max
+        # (h, w) -> (scale, new_w, new_h, x_off, y_off)
+        self._geometry: Dict[Tuple[int, int], Tuple[float, int, int, int, int]] = {}
+        self._canvas_key: Optional[Tuple[int, int]] = None
+    
+    def geometry(self, h: int, w: int) -> Tuple[float, int, int, int, int]:
+        """Get (cached) letterbox scale, resized size and offsets for an input resolution."""
+        key = (h, w)
+        geo = self._geometry.get(key)
+        if geo is None:
+            scale = min(self.size / w, self.size / h)
+            new_w, new_h = int(w * scale), int(h * scale)
+            x_off = (self.size - new_w) // 2
+            y_off = (self.size - new_h) // 2
+            geo = (scale, new_w, new_h, x_off, y_off)
+            if len(self._geometry) >= 8:
+                self._geometry.clear()
+            self._geometry[key] = geo
+        return geo
+    
+    def __call__(self, frame: np.ndarray, out: Optional[np.ndarray] = None) -> Tuple[np.ndarray, float, Tuple[int, int]]:
+        """
+        Letterbox a BGR frame into the reusable input tensor.
+        
+        The returned tensor is overwritten by the next call; copy it if it must outlive the frame.
+        
+        Args:
+            frame: BGR image
+            out: Optional [3, size, size] float32 view to write into instead (e.g. one slot of a tile batch)
+        
+        Returns:
+            Tuple of (tensor [1, 3, size, size] or out, scale, (x_off, y_off))
+        """
+        if self.canvas is None:
+            self.canvas = np.full((self.size, self.size, 3), self.pad_value, dtype=np.uint8)
+            self.tensor = np.empty((1, 3, self.size, self.size), dtype=np.float32)
+        
+        h, w = frame.shape[:2]
+        scale, new_w, new_h, x_off, y_off = self.geometry(h, w)
+        
+        # Padding only needs repainting when the resolution (and so the ROI) changes
+        if self._canvas_key != (h, w):
+            self.canvas[:] = self.pad_value
+            self._canvas_key = (h, w)
+        
+        # Resize straight into the canvas ROI (no intermediate image)
+        roi = self.canvas[y_off:y_off+new_h, x_off:x_off+new_w]
+        if (new_w, new_h) == (w, h):
+            roi[...] = frame
+        else:
+            cv2.resize(frame, (new_w, new_h), dst=roi, interpolation=cv2.INTER_LINEAR)
+        
+        # BGR->RGB, HWC->CHW and /255 fused into one pass over strided views
+        target = self.tensor[0] if out is None else out
+        np.multiply(self.canvas[:, :, ::-1].transpose(2, 0, 1), 1.0 / 255.0,
+                    out=target, casting='unsafe')
+        
+        return (self.tensor if out is None else out), scale, (x_off, y_off)
+
+
+class DetectionEngine:
+    """
+    Process-wide weapon model: one ONNX session shared by every camera's detector.
+    
+    Holds no per-camera state, so any number of detectors may call infer() concurrently
+    (ONNX Runtime sessions are thread-safe; the optional batch scheduler serialises runs).
+    """
+    
+    def __init__(self, session: Optional[rt.InferenceSession], device: str = "CPU",
+                 model_path: Optional[str] = None):
+        self.session = session
+        self.device = device
+        self.model_path = model_path
+        
+        self.input_name = session.get_inputs()[0].name if session else None
+        self.output_name = session.get_outputs()[0].name if session else None
+        
+        # Models exported with a static batch of 1 need tiles run one at a time
+        batch_dim = session.get_inputs()[0].shape[0] if session else 1
+        self.supports_batching = not isinstance(batch_dim, int) or batch_dim > 1
+        
+        self.inference_scheduler: Optional[BatchInferenceScheduler] = None
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def load(cls, gun_model_path: str = "normal.onnx", use_gpu: bool = True,
+             intra_op_threads: int = 0) -> "DetectionEngine":
+        """Load a new engine (prefer get_shared_engine() to reuse an already loaded model)."""
+        session, device = load_gun_model(gun_model_path, use_gpu, intra_op_threads)
+        return cls(session, device, gun_model_path)
+    
+    def enable_batching(self, max_batch: int = 8, max_wait_ms: float = 10.0) -> BatchInferenceScheduler:
+        """Route inference through a cross-camera batch scheduler (created once, then reused)."""
+        with self._lock:
+            if self.inference_scheduler is None:
+                self.inference_scheduler = BatchInferenceScheduler(
+                    self.session,
+                    device=self.device,
+                    max_batch=max_batch,
+                    max_wait_ms=max_wait_ms,
+                )
+            return self.inference_scheduler
+    
+    def infer(self, tensor: np.ndarray) -> np.ndarray:
+        """Run an [N, 3, 640, 640] tensor through the scheduler or the session directly ([N, ...] out)."""
+        if self.inference_scheduler is not None:
+            return self.inference_scheduler.infer(tensor)
+        if tensor.shape[0] == 1 or self.supports_batching:
+            return self.session.run([self.output_name], {self.input_name: tensor})[0]
+        return np.concatenate([
+            self.session.run([self.output_name], {self.input_name: tensor[i:i + 1]})[0]
+            for i in range(tensor.shape[0])
+        ], axis=0)
+    
+    def get_stats(self) -> Dict:
+        """Get engine statistics."""
+        return {
+            'model_path': self.model_path,
+            'device': self.device,
+            'loaded': self.session is not None,
+            'batching': self.inference_scheduler.get_stats() if self.inference_scheduler else None,
+        }
+
+
+_shared_engines: Dict[Tuple[str, bool], DetectionEngine] = {}
+_shared_engines_lock = threading.Lock()
+
+
+def get_shared_engine(gun_model_path: str = "normal.onnx", use_gpu: bool = True,
+                      intra_op_threads: int = 0) -> DetectionEngine:
+    """
+    Get the process-wide engine for a model, loading it on first use.
+    
+    Every detector built for the same model file shares one session. A model that fails to
+    load is not cached, so a later call retries.
+    """
+    key = (os.path.abspath(gun_model_path), use_gpu)
+    with _shared_engines_lock:
+        engine = _shared_engines.get(key)
+        if engine is None:
+            engine = DetectionEngine.load(gun_model_path, use_gpu, intra_op_threads)
+            if engine.session is not None:
+                _shared_engines[key] = engine
+        return engine
+
+
+class DetectorState:
+    """
+    Per-camera detector state: reusable buffers, temporal history, tracks and statistics.
+    
+    Everything that differs between cameras lives here; the model lives in DetectionEngine.
+    """
+    
+    def __init__(self, motion_engine: str = "farneback", motion_width: Optional[int] = None,
+                 person_model: str = "mog2"):
+        # Letterbox buffers, reused for every frame
+        self.preprocessor = LetterboxPreprocessor(640)
+        self.tile_tensor: Optional[np.ndarray] = None
+        self.last_tile_count = 0
+        
+        # Weapon tracking: stable IDs, and propagated boxes between inference frames
+        self.tracker = WeaponTracker()
+        self.inference_frames = 0
+        self.tracked_frames = 0
+        self.frames_since_inference = 0
+        self.tracker_shape = None
         
         # Motion-based threat detection (for CCTV)
+        self.motion_engine = create_motion_engine(motion_engine, motion_width)
         self.prev_frame = None
         self.motion_history = deque(maxlen=30)
         self.high_motion_regions = []
         
+        # Motion-gated cascade
+        self.cascade_activity = 0.0
+        self.cascade_frames_skipped = 0
+        self.cascade_prev = None
+        self.cascade_hold = 0
+        self.last_full_eval = 0.0
+        
+        # Region of interest: polygons in normalised [0, 1] frame coordinates so they
+        # survive resolution changes (network sources are downscaled before detection)
+        self.roi_polygons: Optional[List[np.ndarray]] = None
+        self.roi_cache: Dict[Tuple[int, int], Tuple] = {}  # frame (h, w) -> (polygons, box, crop mask)
+        
+        # Person-like region extraction (incremental background model per camera)
+        if person_model == "edges":
+            self.background_model = None
+        elif person_model in BACKGROUND_METHODS:
+            self.background_model = BackgroundModel(person_model)
+        else:
+            raise ValueError(f"Unknown person model: {person_model}")
+        
         # Person-like region tracking
         self.person_regions = defaultdict(lambda: deque(maxlen=10))
         self.region_violence_score = defaultdict(float)
@@ -57,210 +425,486 @@ class CCTVCrimeDetector:
         self.frame_count = 0
         self.threat_history = deque(maxlen=100)
         self.inference_time = 0.0
+        self.feature_cache_hits = 0
+        self.feature_cache_misses = 0
+        self.stage_times: Dict[str, float] = {}
+
+
+class CCTVCrimeDetector:
+    """Optimized detector specifically for CCTV surveillance footage."""
+    
+    def __init__(self, gun_model_path: str = "normal.onnx", use_gpu: bool = True,
+                 engine: Optional[DetectionEngine] = None, cascade: bool = False,
+                 inference_mode: str = "single", track_interval: int = 1, stage_executor=None,
+                 motion_engine: str = "farneback", motion_width: Optional[int] = None,
+                 person_model: str = "mog2"):
+        """
+        Initialize CCTV-optimized detector.
+        
+        Args:
+            gun_model_path: Path to the ONNX weapon model (loaded once per process and shared)
+            use_gpu: Prefer CoreML/CUDA providers when available
+            engine: Optional DetectionEngine to use instead of the shared engine for
+                gun_model_path (e.g. one with cross-camera batching enabled)
+            cascade: Gate the expensive stages behind a cheap frame-difference check
+            inference_mode: "single" letterboxes the whole frame into one 640 input;
+                "tiled" splits larger frames into overlapping 640 tiles run as one batch
+            track_interval: Run weapon inference every N analysed frames and propagate tracked
+                boxes in between (1 = inference on every frame)
+            stage_executor: Optional StageExecutor; when given, weapon inference, optical flow
+                and clustering run concurrently instead of one after another
+            motion_engine: "farneback", "dis_ultrafast", "dis_fast", "lk" or "diff"
+            motion_width: Working width for the motion engine (None = full resolution)
+            person_model: Person-region source for clustering: a background model
+                ("mog2", "knn", "running_avg") or "edges" (Canny, recomputed every frame)
+        """
+        if inference_mode not in ("single", "tiled"):
+            raise ValueError(f"Unknown inference mode: {inference_mode}")
+        
+        # ONNX model for gun detection, shared by every detector in the process
+        self.engine = engine if engine is not None else get_shared_engine(gun_model_path, use_gpu)
+        self.session = self.engine.session
+        self.device = self.engine.device
+        
+        # Everything that differs between cameras
+        self.state = DetectorState(motion_engine, motion_width, person_model)
+        
+        # CCTV-specific settings
+        self.cctv_gun_confidence = 0.35  # More sensitive for CCTV
+        self.cctv_weapon_size_min = 15   # Lower min size
+        self.cctv_weapon_size_max = 600  # Higher max
+        self.cctv_nms_iou = 0.45         # Merge overlapping boxes on the same weapon
+        self.cctv_max_candidates = 300   # Cap on boxes entering NMS
+        
+        # Tiled high-resolution inference (trades throughput for small-object range)
+        self.inference_mode = inference_mode
+        self.tile_overlap = 64  # Pixels shared by neighbouring tiles so edge weapons are seen whole
+        
+        # Parallel stage execution (None = sequential)
+        self.stage_executor = stage_executor
+        
+        # Weapon tracking cadence
+        self.track_interval = max(1, int(track_interval))
+        
+        # Motion-gated cascade: a downscaled frame difference decides whether the
+        # weapon/flow/clustering stages run at all
+        self.cascade_enabled = cascade
+        self.cascade_pyramid_level = 2         # 1/4 resolution for the cheap check
+        self.cascade_pixel_threshold = 25      # Gray-level change counted as activity
+        self.cascade_motion_threshold = 0.002  # Fraction of changed pixels that wakes the cascade
+        self.cascade_hold_frames = 5           # Keep running full stages after activity stops
+        self.cascade_keepalive_s = 2.0         # Idle cameras still get a full check this often
         
         print(f"✅ CCTV Crime Detector initialized on {self.device}")
     
-    def preprocess_for_cctv(self, frame: np.ndarray) -> Tuple[np.ndarray, float]:
-        """Preprocess frame specifically for CCTV."""
+    def preprocess_for_cctv(self, frame: np.ndarray) -> Tuple[np.ndarray, float, Tuple[int, int]]:
+        """Preprocess frame specifically for CCTV (returns tensor, scale, letterbox offset)."""
+        # For CCTV: maintain aspect ratio, letter-box to 640x640 into reused buffers
+        return self.state.preprocessor(frame)
+    
+    def decode_weapon_output(self, output: np.ndarray, frame_shape: Tuple[int, ...],
+                             scale: float, offset: Tuple[int, int]) -> np.ndarray:
+        """
+        Decode one raw model output into NMS-filtered weapon boxes.
+        
+        Args:
+            output: Raw output for one image, shaped [6, 8400] (or [1, 6, 8400])
+            frame_shape: Shape of the original frame
+            scale: Letterbox scale used in preprocessing
+            offset: Letterbox (x_off, y_off) padding used in preprocessing
+            
+        Returns:
+            WEAPON_DTYPE structured array in original frame coordinates
+        """
+        if output.ndim == 3:
+            output = output[0]
+        
+        # sigmoid(x) < x for x > 0, so the raw value is a safe pre-filter for logits too
+        raw_conf = output[4]
+        idx = np.flatnonzero(raw_conf >= self.cctv_gun_confidence)
+        if idx.size == 0:
+            return np.empty(0, dtype=WEAPON_DTYPE)
+        
+        # Sigmoid normalize (only candidates, only values that look like logits)
+        conf = raw_conf[idx].astype(np.float32)
+        logits = conf > 1.0
+        conf[logits] = 1.0 / (1.0 + np.exp(-conf[logits]))
+        passed = conf >= self.cctv_gun_confidence
+        idx, conf = idx[passed], conf[passed]
+        if idx.size == 0:
+            return np.empty(0, dtype=WEAPON_DTYPE)
+        
+        # Keep the strongest candidates only
+        if idx.size > self.cctv_max_candidates:
+            top = np.argpartition(-conf, self.cctv_max_candidates)[:self.cctv_max_candidates]
+            idx, conf = idx[top], conf[top]
+        
+        # Box conversion: undo letterbox offset, then scale
+        xc, yc, bw, bh = output[0, idx], output[1, idx], output[2, idx], output[3, idx]
+        x_off, y_off = offset
+        h, w = frame_shape[:2]
+        boxes = np.stack([
+            (xc - bw / 2 - x_off) / scale,
+            (yc - bh / 2 - y_off) / scale,
+            (xc + bw / 2 - x_off) / scale,
+            (yc + bh / 2 - y_off) / scale,
+        ], axis=1).astype(np.int32)
+        np.clip(boxes[:, 0::2], 0, w, out=boxes[:, 0::2])
+        np.clip(boxes[:, 1::2], 0, h, out=boxes[:, 1::2])
+        
+        # CCTV-specific filtering
+        box_w = boxes[:, 2] - boxes[:, 0]
+        box_h = boxes[:, 3] - boxes[:, 1]
+        aspect = box_w / (box_h + 1e-6)
+        valid = (
+            (box_w >= self.cctv_weapon_size_min) & (box_h >= self.cctv_weapon_size_min) &
+            (box_w <= self.cctv_weapon_size_max) & (box_h <= self.cctv_weapon_size_max) &
+            (aspect >= 0.2) & (aspect <= 5.0)  # Wider tolerance for CCTV angles
+        )
+        boxes, conf = boxes[valid], conf[valid]
+        
+        keep = non_max_suppression(boxes, conf, self.cctv_nms_iou)
+        
+        weapons = np.empty(keep.size, dtype=WEAPON_DTYPE)
+        weapons['x1'], weapons['y1'] = boxes[keep, 0], boxes[keep, 1]
+        weapons['x2'], weapons['y2'] = boxes[keep, 2], boxes[keep, 3]
+        weapons['confidence'] = conf[keep]
+        return weapons
+    
+    def _run_model(self, tensor: np.ndarray) -> np.ndarray:
+        """Run an [N, 3, 640, 640] tensor through the shared engine ([N, ...] out)."""
+        return self.engine.infer(tensor)
+    
+    def _detect_weapons_tiled(self, frame: np.ndarray) -> np.ndarray:
+        """Run overlapping 640 tiles of a large frame as one batch and merge them with cross-tile NMS."""
+        state = self.state
+        size = state.preprocessor.size
         h, w = frame.shape[:2]
+        origins = [(x, y) for y in tile_origins(h, size, self.tile_overlap)
+                   for x in tile_origins(w, size, self.tile_overlap)]
         
-        # For CCTV: maintain aspect ratio
-        scale = min(640 / w, 640 / h)
-        new_w, new_h = int(w * scale), int(h * scale)
+        if state.tile_tensor is None or state.tile_tensor.shape[0] != len(origins):
+            state.tile_tensor = np.empty((len(origins), 3, size, size), dtype=np.float32)
         
-        resized = cv2.resize(frame, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+        geometry = []
+        for i, (x, y) in enumerate(origins):
+            tile = frame[y:y+size, x:x+size]
+            _, scale, offset = state.preprocessor(tile, out=state.tile_tensor[i])
+            geometry.append((tile.shape, scale, offset))
         
-        # Letter-box to 640x640
-        canvas = np.full((640, 640, 3), 114, dtype=np.uint8)
-        y_off = (640 - new_h) // 2
-        x_off = (640 - new_w) // 2
-        canvas[y_off:y_off+new_h, x_off:x_off+new_w] = resized
+        outputs = self._run_model(state.tile_tensor)
+        state.last_tile_count = len(origins)
         
-        # Normalize
-        processed = canvas.astype(np.float32) / 255.0
-        processed = cv2.cvtColor(processed, cv2.COLOR_BGR2RGB)
-        processed = np.transpose(processed, (2, 0, 1))
-        processed = np.expand_dims(processed, 0)
+        parts = []
+        for i, (x, y) in enumerate(origins):
+            weapons = self.decode_weapon_output(outputs[i], *geometry[i])
+            weapons['x1'] += x
+            weapons['x2'] += x
+            weapons['y1'] += y
+            weapons['y2'] += y
+            parts.append(weapons)
+        weapons = np.concatenate(parts)
         
-        return processed, scale
+        # The same weapon seen in two overlapping tiles collapses to one box
+        if len(weapons) > 1:
+            boxes = np.stack([weapons['x1'], weapons['y1'], weapons['x2'], weapons['y2']], axis=1)
+            weapons = weapons[non_max_suppression(boxes, weapons['confidence'], self.cctv_nms_iou)]
+        return weapons
     
-    def detect_weapons_cctv(self, frame: np.ndarray) -> List[Dict]:
-        """Detect weapons in CCTV footage."""
+    def detect_weapons_cctv(self, frame: np.ndarray,
+                            features: Optional[FrameFeatures] = None) -> List[Dict]:
+        """Detect weapons in CCTV footage (only inside the ROI crop when features carry one)."""
         if self.session is None:
             return []
         
-        start = time.time()
-        processed, scale = self.preprocess_for_cctv(frame)
+        # Tight ROI crop gives small weapons more of the 640x640 input
+        crop = features.frame if features is not None else frame
+        tiled = self.inference_mode == "tiled" and max(crop.shape[:2]) > self.state.preprocessor.size
         
+        start = time.time()
         try:
-            outputs = self.session.run([self.output_name], {self.input_name: processed})
-            self.inference_time = (time.time() - start) * 1000
+            if tiled:
+                weapons = self._detect_weapons_tiled(crop)
+            else:
+                processed, scale, offset = self.preprocess_for_cctv(crop)
+                # Parse outputs [1, 6, 8400]
+                weapons = self.decode_weapon_output(self._run_model(processed), crop.shape, scale, offset)
+                self.state.last_tile_count = 1
+            self.state.inference_time = (time.time() - start) * 1000
         except:
             return []
         
-        # Parse outputs [1, 6, 8400]
-        output = outputs[0].squeeze(0).transpose(1, 0)
-        
-        x_center = output[:, 0]
-        y_center = output[:, 1]
-        widths = output[:, 2]
-        heights = output[:, 3]
-        conf = output[:, 4]
-        
-        # Sigmoid normalize
-        conf = np.where(conf > 1.0, 1.0 / (1.0 + np.exp(-conf)), conf)
-        
-        # CCTV threshold: more lenient
-        mask = conf >= self.cctv_gun_confidence
-        if not np.any(mask):
-            return []
+        if features is not None and features.mask is not None and len(weapons):
+            # Drop boxes centred outside the ROI polygons
+            cx = (weapons['x1'] + weapons['x2']) // 2
+            cy = (weapons['y1'] + weapons['y2']) // 2
+            cx = np.clip(cx, 0, features.mask.shape[1] - 1)
+            cy = np.clip(cy, 0, features.mask.shape[0] - 1)
+            weapons = weapons[features.mask[cy, cx] > 0]
         
-        detections = []
-        h, w = frame.shape[:2]
+        if features is not None and features.offset != (0, 0):
+            # Map crop coordinates back to the full frame
+            x_off, y_off = features.offset
+            weapons['x1'] += x_off
+            weapons['x2'] += x_off
+            weapons['y1'] += y_off
+            weapons['y2'] += y_off
         
-        for i in np.where(mask)[0]:
-            x1 = int((x_center[i] - widths[i]/2) / scale)
-            y1 = int((y_center[i] - heights[i]/2) / scale)
-            x2 = int((x_center[i] + widths[i]/2) / scale)
-            y2 = int((y_center[i] + heights[i]/2) / scale)
-            
-            x1, y1 = max(0, x1), max(0, y1)
-            x2, y2 = min(w, x2), min(h, y2)
-            
-            box_w = x2 - x1
-            box_h = y2 - y1
-            
-            # CCTV-specific filtering
-            if box_w < self.cctv_weapon_size_min or box_h < self.cctv_weapon_size_min:
-                continue
-            if box_w > self.cctv_weapon_size_max or box_h > self.cctv_weapon_size_max:
-                continue
-            
-            aspect = box_w / (box_h + 1e-6)
-            if aspect < 0.2 or aspect > 5.0:  # Wider tolerance for CCTV angles
-                continue
-            
-            detections.append({
-                'box': (x1, y1, x2, y2),
-                'confidence': float(conf[i]),
-                'class': 'weapon'
-            })
-        
-        return detections
+        return weapons_to_dicts(weapons)
+    
+    def _motion_input(self, features: FrameFeatures) -> Tuple[np.ndarray, float]:
+        """Blurred gray at the motion engine's working resolution, and its scale."""
+        scale = self.state.motion_engine.working_scale(features.frame.shape[1])
+        return features.blurred_gray_at(scale), scale
     
-    def detect_motion_threats(self, frame: np.ndarray) -> Tuple[float, List[Dict]]:
-        """Detect motion-based threats using optical flow (CCTV-optimized)."""
-        frame_gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        frame_gray = cv2.GaussianBlur(frame_gray, (5, 5), 0)
+    def detect_motion_threats(self, frame: np.ndarray,
+                              features: Optional[FrameFeatures] = None) -> Tuple[float, List[Dict]]:
+        """Detect motion-based threats with the configured motion engine (CCTV-optimized)."""
+        state = self.state
+        features = features or FrameFeatures(frame)
+        frame_gray, scale = self._motion_input(features)
         
         motion_score = 0.0
         motion_regions = []
         
-        if self.prev_frame is not None and self.prev_frame.shape == frame_gray.shape:
+        if state.prev_frame is not None and state.prev_frame.shape == frame_gray.shape:
             # Optical flow - only calculate if frames have same dimensions
-            flow = cv2.calcOpticalFlowFarneback(
-                self.prev_frame, frame_gray, None,
-                0.5, 3, 15, 3, 5, 1.2, 0
-            )
+            # CCTV: large motion = threat (more sensitive, 15 full-resolution px; was 30)
+            high_motion = state.motion_engine.motion_mask(state.prev_frame, frame_gray, scale)
+            mask = features.mask_at(high_motion.shape)
+            if mask is not None:
+                high_motion &= mask > 0
             
-            mag, ang = cv2.cartToPolar(flow[..., 0], flow[..., 1])
-            
-            # CCTV: large motion = threat (more sensitive)
-            high_motion = mag > 15  # More sensitive (was 30)
-            motion_area = np.sum(high_motion)
-            
-            if motion_area > 500:  # More sensitive (was 1000)
-                motion_score = min(1.0, motion_area / 50000.0)
-                
-                # Find motion regions
-                contours, _ = cv2.findContours(
-                    high_motion.astype(np.uint8),
-                    cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE
-                )
-                
-                for cnt in contours:
-                    area = cv2.contourArea(cnt)
-                    if area > 500:
-                        m = cv2.moments(cnt)
-                        if m['m00'] > 0:
-                            cx, cy = int(m['m10']/m['m00']), int(m['m01']/m['m00'])
-                            motion_regions.append({
-                                'center': (cx, cy),
-                                'area': area,
-                                'threat_level': min(1.0, area / 10000.0)
-                            })
-        
-        self.prev_frame = frame_gray.copy()
-        self.motion_history.append(motion_score)
-        self.high_motion_regions = motion_regions
+            motion_score, motion_regions = motion_regions_from_mask(high_motion, scale, features.offset)
+        elif state.prev_frame is not None:
+            state.motion_engine.reset()
+        
+        state.prev_frame = frame_gray  # Fresh per-frame array, never modified in place
+        state.motion_history.append(motion_score)
+        state.high_motion_regions = motion_regions
         
         return motion_score, motion_regions
     
-    def detect_person_clustering(self, frame: np.ndarray) -> Tuple[float, List[Dict]]:
-        """Detect suspicious person clustering (crowding = potential crime in CCTV)."""
-        
-        # Simple background subtraction to find moving objects
-        frame_hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
-        
-        # Detect motion blobs
-        blurred = cv2.GaussianBlur(frame_hsv, (7, 7), 0)
-        
-        # Use Canny edge detection for CCTV
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        edges = cv2.Canny(gray, 50, 150)
+    def _person_mask(self, features: FrameFeatures) -> Tuple[Optional[np.ndarray], float]:
+        """Mask of person-like regions and its scale (None while the background model warms up)."""
+        if self.state.background_model is not None:
+            # Foreground blobs against the camera's learned background: static edges drop out
+            scale = self.state.background_model.working_scale(features.frame.shape[1])
+            person_mask = self.state.background_model.apply(features.blurred_gray_at(scale))
+        else:
+            # Use Canny edge detection for CCTV, dilated to find connected regions
+            scale = 1.0
+            kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (7, 7))
+            person_mask = cv2.dilate(features.edges, kernel, iterations=2)
         
-        # Dilate to find connected regions
-        kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (7, 7))
-        dilated = cv2.dilate(edges, kernel, iterations=2)
+        if person_mask is not None:
+            mask = features.mask_at(person_mask.shape)
+            if mask is not None:
+                person_mask = cv2.bitwise_and(person_mask, mask)
+        return person_mask, scale
+    
+    def detect_person_clustering(self, frame: np.ndarray,
+                                 features: Optional[FrameFeatures] = None) -> Tuple[float, List[Dict]]:
+        """Detect suspicious person clustering (crowding = potential crime in CCTV)."""
+        features = features or FrameFeatures(frame)
         
-        # Find contours (person-like regions)
-        contours, _ = cv2.findContours(dilated, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        person_mask, scale = self._person_mask(features)
         
+        # Find contours (person-like regions); areas in full-resolution pixels
         regions = []
-        for cnt in contours:
-            area = cv2.contourArea(cnt)
-            if 500 < area < 20000:  # Person-like size
-                m = cv2.moments(cnt)
-                if m['m00'] > 0:
-                    cx, cy = int(m['m10']/m['m00']), int(m['m01']/m['m00'])
-                    regions.append((cx, cy, area))
+        if person_mask is not None:
+            contours, _ = cv2.findContours(person_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+            area_scale = 1.0 / (scale * scale)
+            x_off, y_off = features.offset
+            for cnt in contours:
+                area = cv2.contourArea(cnt) * area_scale
+                if 500 < area < 20000:  # Person-like size
+                    m = cv2.moments(cnt)
+                    if m['m00'] > 0:
+                        cx = int(m['m10'] / m['m00'] / scale) + x_off
+                        cy = int(m['m01'] / m['m00'] / scale) + y_off
+                        regions.append((cx, cy, area))
         
         # Check for clustering (multiple people close together)
         cluster_threat = 0.0
         clustering_events = []
         
         if len(regions) > 2:
-            # Calculate pairwise distances
-            cluster_count = 0
-            for i, (x1, y1, a1) in enumerate(regions):
-                neighbors = 0
-                for j, (x2, y2, a2) in enumerate(regions):
-                    if i != j:
-                        dist = np.sqrt((x1-x2)**2 + (y1-y2)**2)
-                        if dist < 100:  # Close proximity
-                            neighbors += 1
-                
-                if neighbors >= 2:
-                    cluster_count += 1
-                    clustering_events.append({
-                        'center': (x1, y1),
-                        'people_nearby': neighbors,
-                        'threat_level': min(1.0, neighbors / 5.0)
-                    })
+            # Neighbor counts via distance matrix or grid hash (chosen by region count)
+            points = np.array([(x, y) for x, y, _ in regions], dtype=np.float64)
+            neighbors = count_neighbors(points, 100)  # Close proximity
             
-            cluster_threat = min(1.0, cluster_count / 10.0)
+            clustered = np.flatnonzero(neighbors >= 2)
+            for i in clustered:
+                clustering_events.append({
+                    'center': regions[i][:2],
+                    'people_nearby': int(neighbors[i]),
+                    'threat_level': min(1.0, float(neighbors[i]) / 5.0)
+                })
+            
+            cluster_threat = min(1.0, len(clustered) / 10.0)
         
         return cluster_threat, clustering_events
     
-    def detect_frame(self, frame: np.ndarray) -> Dict:
-        """Detect crimes in CCTV frame."""
-        self.frame_count += 1
+    def set_roi(self, polygons: Optional[List[List[Tuple[float, float]]]]) -> None:
+        """
+        Restrict analysis to polygons in normalised (x, y) coordinates, or None for the full frame.
+        
+        Raises:
+            ValueError: If a polygon has fewer than 3 points, coordinates outside [0, 1], or no area
+        """
+        state = self.state
+        if not polygons:
+            state.roi_polygons = None
+            state.roi_cache = {}
+            return
+        
+        state.roi_polygons = parse_roi_polygons(polygons)
+        state.roi_cache = {}
+    
+    def _roi_geometry(self, shape: Tuple[int, ...]) -> Tuple[Optional[Tuple[int, int, int, int]], Optional[np.ndarray]]:
+        """Bounding crop and crop-sized mask of the ROI for a frame shape (cached per shape)."""
+        state = self.state
+        polygons = state.roi_polygons
+        if polygons is None:
+            return None, None
+        
+        h, w = shape[:2]
+        cached = state.roi_cache.get((h, w))
+        if cached is not None and cached[0] is polygons:
+            return cached[1], cached[2]
+        
+        pixel_polys = [np.round(p * [w - 1, h - 1]).astype(np.int32) for p in polygons]
+        mask = np.zeros((h, w), dtype=np.uint8)
+        cv2.fillPoly(mask, pixel_polys, 255)
+        
+        x, y, bw, bh = cv2.boundingRect(np.concatenate(pixel_polys))
+        box = (x, y, min(w, x + bw), min(h, y + bh))
+        crop_mask = np.ascontiguousarray(mask[box[1]:box[3], box[0]:box[2]])
+        
+        if len(state.roi_cache) >= 4:
+            state.roi_cache = {}
+        state.roi_cache[(h, w)] = (polygons, box, crop_mask)
+        return box, crop_mask
+    
+    def _detect_weapons_full_res(self, frame: np.ndarray, inference_frame: np.ndarray) -> List[Dict]:
+        """Detect weapons on the original frame and map the boxes onto the analysis frame."""
+        features = FrameFeatures(inference_frame, *self._roi_geometry(inference_frame.shape))
+        weapons = self.detect_weapons_cctv(inference_frame, features)
+        
+        sx = frame.shape[1] / inference_frame.shape[1]
+        sy = frame.shape[0] / inference_frame.shape[0]
+        for weapon in weapons:
+            x1, y1, x2, y2 = weapon['box']
+            weapon['box'] = (int(x1 * sx), int(y1 * sy), int(x2 * sx), int(y2 * sy))
+        return weapons
+    
+    def _detect_or_track_weapons(self, frame: np.ndarray, features: FrameFeatures,
+                                 inference_frame: Optional[np.ndarray]) -> List[Dict]:
+        """Run inference every track_interval frames (or when tracks are uncertain), else propagate tracks."""
+        state = self.state
+        if state.tracker_shape != frame.shape[:2]:
+            state.tracker.reset()
+            state.tracker_shape = frame.shape[:2]
+            state.frames_since_inference = self.track_interval  # Force inference
+        
+        due = state.frames_since_inference + 1 >= self.track_interval
+        if not due and not state.tracker.is_uncertain():
+            state.frames_since_inference += 1
+            state.tracked_frames += 1
+            return state.tracker.predict(frame.shape)
+        
+        if inference_frame is not None and inference_frame.shape[:2] != frame.shape[:2]:
+            weapons = self._detect_weapons_full_res(frame, inference_frame)
+        else:
+            weapons = self.detect_weapons_cctv(frame, features)
+        state.frames_since_inference = 0
+        state.inference_frames += 1
+        return state.tracker.update(weapons)
+    
+    def _cascade_gate(self, features: FrameFeatures) -> bool:
+        """Cheap motion stage: True if the expensive stages should run on this frame."""
+        state = self.state
+        small = features.pyramid(self.cascade_pyramid_level)
+        
+        if state.cascade_prev is not None and state.cascade_prev.shape == small.shape:
+            changed = cv2.absdiff(small, state.cascade_prev) > self.cascade_pixel_threshold
+            mask = features.mask_at(small.shape)
+            if mask is not None:
+                changed &= mask > 0
+                state.cascade_activity = np.count_nonzero(changed) / max(1, np.count_nonzero(mask))
+            else:
+                state.cascade_activity = np.count_nonzero(changed) / changed.size
+            active = state.cascade_activity >= self.cascade_motion_threshold
+        else:
+            active = True  # First frame or resolution change
+        state.cascade_prev = small
+        
+        if active:
+            state.cascade_hold = self.cascade_hold_frames
+        elif state.cascade_hold > 0:
+            state.cascade_hold -= 1
+            active = True
+        
+        now = time.time()
+        if not active and now - state.last_full_eval >= self.cascade_keepalive_s:
+            active = True  # Keep-alive check on idle cameras
+        if active:
+            state.last_full_eval = now
+        return active
+    
+    def detect_frame(self, frame: np.ndarray, inference_frame: Optional[np.ndarray] = None) -> Dict:
+        """
+        Detect crimes in CCTV frame.
+        
+        Args:
+            frame: Frame used for motion/clustering analysis and result coordinates
+            inference_frame: Optional higher-resolution original of the same frame; weapon
+                inference then reads it directly instead of re-upscaling a downscaled frame
+        """
+        state = self.state
+        state.frame_count += 1
         h, w = frame.shape[:2]
         
+        # Shared lazily computed gray/blur/edges for all stages of this frame (ROI crop only)
+        roi_box, roi_mask = self._roi_geometry(frame.shape)
+        features = FrameFeatures(frame, roi_box, roi_mask)
+        
+        run_stages = not self.cascade_enabled or self._cascade_gate(features)
+        
         # Get threat scores
-        weapons = self.detect_weapons_cctv(frame)
-        motion_score, motion_regions = self.detect_motion_threats(frame)
-        cluster_score, clustering = self.detect_person_clustering(frame)
+        if run_stages:
+            # The three stages touch disjoint detector state, so they may run concurrently;
+            # results are merged by name, independent of completion order
+            stages = [
+                ('weapons', lambda: self._detect_or_track_weapons(frame, features, inference_frame)),
+                ('motion', lambda: self.detect_motion_threats(frame, features)),
+                ('clustering', lambda: self.detect_person_clustering(frame, features)),
+            ]
+            if self.stage_executor is not None:
+                outputs, state.stage_times = self.stage_executor.run(stages)
+            else:
+                outputs = {}
+                for name, stage in stages:
+                    stage_start = time.perf_counter()
+                    outputs[name] = stage()
+                    state.stage_times[name] = (time.perf_counter() - stage_start) * 1000
+            
+            weapons = outputs['weapons']
+            motion_score, motion_regions = outputs['motion']
+            cluster_score, clustering = outputs['clustering']
+        else:
+            # Idle frame: skip inference and flow, but keep the flow reference current
+            # so the first active frame is compared with its real predecessor
+            state.cascade_frames_skipped += 1
+            weapons, motion_regions, clustering = [], [], []
+            motion_score = cluster_score = 0.0
+            state.prev_frame, _ = self._motion_input(features)
+            state.motion_history.append(motion_score)
+            state.high_motion_regions = motion_regions
+        
+        state.feature_cache_hits += features.hits
+        state.feature_cache_misses += features.misses
         
         # CCTV Crime scoring (adjusted for surveillance)
         # High motion + clustering + weapons = crime
@@ -279,11 +923,11 @@ class CCTVCrimeDetector:
             crime_score += 0.1 * cluster_score
         
         crime_score = min(1.0, crime_score)
-        self.threat_history.append(crime_score)
+        state.threat_history.append(crime_score)
         
         # Temporal smoothing for CCTV (use last 10 frames)
-        if len(self.threat_history) >= 10:
-            smoothed_score = np.mean(list(self.threat_history)[-10:])
+        if len(state.threat_history) >= 10:
+            smoothed_score = np.mean(list(state.threat_history)[-10:])
         else:
             smoothed_score = crime_score
         
@@ -292,8 +936,9 @@ class CCTVCrimeDetector:
         confidence = min(1.0, smoothed_score) if is_crime else min(1.0, 1.0 - smoothed_score)
         
         return {
-            'frame_num': self.frame_count,
+            'frame_num': state.frame_count,
             'weapons': weapons,
+            'track_ids': [w['track_id'] for w in weapons if 'track_id' in w],
             'motion_score': float(motion_score),
             'cluster_score': float(cluster_score),
             'crime_score': float(crime_score),
@@ -301,7 +946,8 @@ class CCTVCrimeDetector:
             'is_crime': is_crime,
             'confidence': float(confidence),
             'motion_regions': motion_regions,
-            'clustering_events': clustering
+            'clustering_events': clustering,
+            'stages_skipped': not run_stages
         }
     
     def annotate_frame(self, frame: np.ndarray, results: Dict) -> np.ndarray:
@@ -313,6 +959,8 @@ class CCTVCrimeDetector:
             x1, y1, x2, y2 = weapon['box']
             cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 0, 255), 2)
             label = f"WEAPON {weapon['confidence']:.0%}"
+            if 'track_id' in weapon:
+                label += f" #{weapon['track_id']}"
             cv2.putText(frame, label, (x1, y1-10), cv2.FONT_HERSHEY_SIMPLEX, 
                        0.6, (0, 0, 255), 2)
         
@@ -357,12 +1005,35 @@ class CCTVCrimeDetector:
     
     def get_stats(self) -> Dict:
         """Get detector statistics."""
-        avg_threat = float(np.mean(self.threat_history)) if self.threat_history else 0.0
+        state = self.state
+        avg_threat = float(np.mean(state.threat_history)) if state.threat_history else 0.0
         
         return {
-            'total_frames': self.frame_count,
+            'total_frames': state.frame_count,
             'average_threat_score': avg_threat,
             'device': self.device,
-            'inference_time_ms': self.inference_time,
-            'motion_regions': len(self.high_motion_regions)
+            'inference_time_ms': state.inference_time,
+            'motion_regions': len(state.high_motion_regions),
+            'inference_mode': self.inference_mode,
+            'tiles_per_frame': state.last_tile_count,
+            'parallel_stages': self.stage_executor is not None,
+            'motion_engine': state.motion_engine.name,
+            'person_model': state.background_model.method if state.background_model else 'edges',
+            'stage_times_ms': {name: round(ms, 2) for name, ms in state.stage_times.items()},
+            'tracking': {
+                'interval': self.track_interval,
+                'active_tracks': len(state.tracker.tracks),
+                'inference_frames': state.inference_frames,
+                'tracked_frames': state.tracked_frames
+            },
+            'feature_cache': {
+                'hits': state.feature_cache_hits,
+                'misses': state.feature_cache_misses
+            },
+            'batching': self.engine.inference_scheduler.get_stats() if self.engine.inference_scheduler else None,
+            'cascade': {
+                'enabled': self.cascade_enabled,
+                'frames_skipped': state.cascade_frames_skipped,
+                'activity': round(float(state.cascade_activity), 4)
+            }
         }
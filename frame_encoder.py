@@ -0,0 +1,158 @@
+"""
+Lazy JPEG Encoding for Live CCTV Frames
+The detection loop only publishes a reference to the newest frame; JPEG and base64 are produced on first request and cached per frame sequence and quality
+"""
+
+import base64
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+class FrameEncoder:
+    """Versioned latest-frame store that encodes to JPEG only when a consumer asks for it."""
+
+    def __init__(self, default_quality: int = 80,
+                 render: Optional[Callable[[np.ndarray, Any], np.ndarray]] = None):
+        """
+        Args:
+            default_quality: JPEG quality used when a consumer does not ask for one
+            render: Optional fn(frame, overlay) -> display image, run once per encoded frame;
+                it must not modify the frame it is given (copy first)
+        """
+        self.default_quality = default_quality
+        self.render = render
+
+        self._frame: Optional[np.ndarray] = None
+        self._overlay: Any = None
+        self.seq = 0
+
+        # Caches for the current sequence number only; older frames are never served
+        self._rendered: Optional[np.ndarray] = None
+        self._jpeg: Dict[int, bytes] = {}
+        self._base64: Dict[int, str] = {}
+
+        self._lock = threading.Lock()
+        self._encode_lock = threading.Lock()  # One encode at a time, so concurrent viewers share it
+
+        # Statistics
+        self.frames_published = 0
+        self.encodes = 0
+        self.base64_encodes = 0
+        self.requests = 0
+        self._publish_times: Deque[float] = deque(maxlen=120)
+        self._encode_times: Deque[float] = deque(maxlen=120)
+
+    def publish(self, frame: np.ndarray, overlay: Any = None) -> int:
+        """
+        Make a frame the latest one (no copy, no encode). The frame must not be modified afterwards.
+
+        Returns:
+            The frame's sequence number
+        """
+        with self._lock:
+            self.seq += 1
+            self._frame = frame
+            self._overlay = overlay
+            self._rendered = None
+            self._jpeg = {}
+            self._base64 = {}
+            self.frames_published += 1
+            self._publish_times.append(time.time())
+            return self.seq
+
+    def get_jpeg(self, quality: Optional[int] = None) -> Optional[Tuple[int, bytes]]:
+        """
+        JPEG bytes of the latest frame, encoded on first request.
+
+        Returns:
+            Tuple of (sequence number, JPEG bytes), or None before the first frame
+        """
+        quality = int(quality or self.default_quality)
+        with self._lock:
+            self.requests += 1
+            if self._frame is None:
+                return None
+            seq = self.seq
+            cached = self._jpeg.get(quality)
+            if cached is not None:
+                return seq, cached
+
+        with self._encode_lock:
+            with self._lock:
+                # Another viewer may have encoded this (or a newer) frame while we waited
+                seq = self.seq
+                cached = self._jpeg.get(quality)
+                if cached is not None:
+                    return seq, cached
+                frame, overlay, rendered = self._frame, self._overlay, self._rendered
+
+            if rendered is None:
+                rendered = self.render(frame, overlay) if self.render else frame
+            ok, buffer = cv2.imencode(".jpg", rendered, [cv2.IMWRITE_JPEG_QUALITY, quality])
+            if not ok:
+                return None
+            data = buffer.tobytes()
+
+            with self._lock:
+                self.encodes += 1
+                self._encode_times.append(time.time())
+                if seq == self.seq:
+                    self._rendered = rendered
+                    self._jpeg[quality] = data
+            return seq, data
+
+    def get_base64(self, quality: Optional[int] = None) -> Optional[str]:
+        """Latest frame as a JPEG data URI (base64 computed once per frame and quality)."""
+        encoded = self.get_data_uri(quality)
+        return encoded[1] if encoded else None
+
+    def get_data_uri(self, quality: Optional[int] = None) -> Optional[Tuple[int, str]]:
+        """
+        Latest frame as a JPEG data URI, with the sequence number of the frame it shows.
+
+        Returns:
+            Tuple of (sequence number, data URI), or None before the first frame
+        """
+        quality = int(quality or self.default_quality)
+        with self._lock:
+            cached = self._base64.get(quality)
+            if cached is not None:
+                self.requests += 1
+                return self.seq, cached
+
+        encoded = self.get_jpeg(quality)
+        if encoded is None:
+            return None
+        seq, data = encoded
+        payload = f"data:image/jpeg;base64,{base64.b64encode(data).decode('utf-8')}"
+        with self._lock:
+            self.base64_encodes += 1
+            if seq == self.seq:
+                self._base64[quality] = payload
+        return seq, payload
+
+    @staticmethod
+    def _rate(times: Deque[float]) -> float:
+        if len(times) < 2:
+            return 0.0
+        # Rate up to now, so it decays to zero once nobody is watching
+        span = time.time() - times[0]
+        return len(times) / span if span > 0 else 0.0
+
+    def get_stats(self) -> Dict:
+        """Get encoding statistics (encodes/s against frames published/s)."""
+        with self._lock:
+            return {
+                'frames_published': self.frames_published,
+                'encodes': self.encodes,
+                'base64_encodes': self.base64_encodes,
+                'requests': self.requests,
+                'published_per_sec': round(self._rate(self._publish_times), 2),
+                'encodes_per_sec': round(self._rate(self._encode_times), 2),
+                'encode_ratio': round(self.encodes / self.frames_published, 3) if self.frames_published else 0.0,
+            }
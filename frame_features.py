@@ -0,0 +1,98 @@
+"""
+Per-Frame Feature Cache for CCTV Detection
+Derived images (gray, blurred gray, working-resolution copies, pyramid levels, edges) computed lazily once and shared by every stage
+"""
+
+import threading
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+class FrameFeatures:
+    """Lazily computed views of one frame, shared by the detector stages."""
+
+    def __init__(self, frame: np.ndarray, roi_box: Optional[Tuple[int, int, int, int]] = None,
+                 roi_mask: Optional[np.ndarray] = None):
+        """
+        Args:
+            frame: Full BGR frame
+            roi_box: Optional (x1, y1, x2, y2) crop; every derived image is computed on this crop only
+            roi_mask: Optional uint8 mask (255 = analysed) with the same size as the crop
+        """
+        self.full_frame = frame
+        if roi_box is not None:
+            x1, y1, x2, y2 = roi_box
+            self.frame = frame[y1:y2, x1:x2]
+            self.offset = (x1, y1)
+        else:
+            self.frame = frame
+            self.offset = (0, 0)
+        self.mask = roi_mask
+        self._cache: Dict[Hashable, np.ndarray] = {}
+
+        # Stages may run on parallel threads: one lock per key so each image is still computed once
+        self._lock = threading.Lock()
+        self._key_locks: Dict[Hashable, threading.Lock] = {}
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+
+    def _get(self, key: Hashable, compute: Callable[[], np.ndarray]) -> np.ndarray:
+        """Return the cached value for key, computing it on first use."""
+        value = self._cache.get(key)
+        if value is None:
+            with self._lock:
+                key_lock = self._key_locks.setdefault(key, threading.Lock())
+            with key_lock:
+                value = self._cache.get(key)
+                if value is None:
+                    value = compute()
+                    self._cache[key] = value
+                    with self._lock:
+                        self.misses += 1
+                    return value
+        with self._lock:
+            self.hits += 1
+        return value
+
+    @property
+    def gray(self) -> np.ndarray:
+        """Grayscale frame."""
+        return self._get('gray', lambda: cv2.cvtColor(self.frame, cv2.COLOR_BGR2GRAY))
+
+    @property
+    def blurred_gray(self) -> np.ndarray:
+        """Grayscale frame with a 5x5 Gaussian blur (optical-flow input)."""
+        return self._get('blurred_gray', lambda: cv2.GaussianBlur(self.gray, (5, 5), 0))
+
+    def blurred_gray_at(self, scale: float) -> np.ndarray:
+        """Blurred gray resized to a working scale (1.0 = full resolution)."""
+        if scale >= 1.0:
+            return self.blurred_gray
+        h, w = self.blurred_gray.shape[:2]
+        size = (max(1, int(round(w * scale))), max(1, int(round(h * scale))))
+        return self._get(('blurred_gray', size),
+                         lambda: cv2.resize(self.blurred_gray, size, interpolation=cv2.INTER_AREA))
+
+    @property
+    def edges(self) -> np.ndarray:
+        """Canny edges of the grayscale frame."""
+        return self._get('edges', lambda: cv2.Canny(self.gray, 50, 150))
+
+    def mask_at(self, shape: Tuple[int, ...]) -> Optional[np.ndarray]:
+        """ROI mask resized to a working resolution (None when the whole crop is analysed)."""
+        if self.mask is None:
+            return None
+        h, w = shape[:2]
+        if self.mask.shape[:2] == (h, w):
+            return self.mask
+        return self._get(('mask', h, w), lambda: cv2.resize(self.mask, (w, h), interpolation=cv2.INTER_NEAREST))
+
+    def pyramid(self, level: int) -> np.ndarray:
+        """Grayscale pyramid level (0 = full resolution, each level halves width and height)."""
+        if level <= 0:
+            return self.gray
+        return self._get(('pyramid', level), lambda: cv2.pyrDown(self.pyramid(level - 1)))
@@ -0,0 +1,174 @@
+"""
+Decoupled Frame Capture for Live CCTV Sources
+A dedicated thread per source keeps only the newest decoded frame, so slow detection drops frames instead of queueing them
+"""
+
+import threading
+import time
+from typing import Dict, Optional
+
+import cv2
+import numpy as np
+
+
+class CapturedFrame:
+    """One decoded frame with its capture time and per-source sequence number."""
+
+    __slots__ = ("frame", "timestamp", "seq")
+
+    def __init__(self, frame: np.ndarray, timestamp: float, seq: int):
+        self.frame = frame
+        self.timestamp = timestamp
+        self.seq = seq
+
+
+class FrameGrabber:
+    """
+    Reads a VideoCapture on its own thread into a single "latest frame" slot.
+
+    Every decoded frame overwrites the slot; frames the consumer never picked up are counted
+    as dropped. With max_fps set, frames arriving faster than that are only grab()bed and
+    never decoded. The grabber owns the capture once started and releases it when its
+    thread exits, so the capture is never released in the middle of a blocking read.
+    """
+
+    def __init__(self, capture: cv2.VideoCapture, max_consecutive_failures: int = 5,
+                 retry_delay: float = 0.1, pace_fps: Optional[float] = None,
+                 max_fps: Optional[float] = None, log_failures: bool = False):
+        """
+        Args:
+            capture: Opened VideoCapture
+            max_consecutive_failures: Failed reads in a row before the source is considered ended
+            retry_delay: Pause after a failed read
+            pace_fps: Read no faster than this (files decode far faster than real time; None = as fast as the source delivers)
+            max_fps: Decode at most this many frames per second; the rest are grabbed and discarded (None = decode all)
+            log_failures: Print each failed read (useful for network streams)
+        """
+        self.capture = capture
+        self.max_consecutive_failures = max_consecutive_failures
+        self.retry_delay = retry_delay
+        self.pace_fps = pace_fps
+        self.max_fps = max_fps
+        self.log_failures = log_failures
+
+        self._latest: Optional[CapturedFrame] = None
+        self._consumed_seq = 0
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self.ended = False
+
+        # Statistics
+        self.frames_captured = 0
+        self.frames_dropped = 0
+        self.frames_skipped = 0  # Grabbed but never decoded
+        self.consecutive_failures = 0
+        self.read_failures = 0
+
+    def start(self) -> None:
+        """Start the capture thread."""
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+            self.ended = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Stop the capture thread (the capture is released when the thread exits)."""
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread and self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(timeout=timeout)
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def _run(self) -> None:
+        """Capture loop: grab every frame, decode only sampled ones, stamp, overwrite the slot."""
+        next_read = time.monotonic()
+        next_decode = 0.0
+        try:
+            while self._running:
+                if self.pace_fps:
+                    delay = next_read - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+                    next_read = max(next_read, time.monotonic() - 1.0) + 1.0 / self.pace_fps
+
+                # grab() pulls the packet off the stream; retrieve() pays for the decode
+                ret = self.capture.grab()
+                frame = None
+                if ret:
+                    now = time.monotonic()
+                    if self.max_fps and now < next_decode:
+                        self.frames_skipped += 1
+                        continue
+                    if self.max_fps:
+                        interval = 1.0 / self.max_fps
+                        # Stay on the sampling grid, but don't burst to catch up after a stall
+                        next_decode = next_decode + interval if now - next_decode < interval else now + interval
+                    ret, frame = self.capture.retrieve()
+                timestamp = time.time()
+
+                if not ret:
+                    self.read_failures += 1
+                    self.consecutive_failures += 1
+                    if self.consecutive_failures > self.max_consecutive_failures:
+                        print("⚠️ Too many consecutive read failures. Stopping capture.")
+                        break
+                    if self.log_failures:
+                        print(f"⚠️ Read failure ({self.consecutive_failures}/{self.max_consecutive_failures}) - retrying...")
+                    time.sleep(self.retry_delay)
+                    continue
+
+                self.consecutive_failures = 0
+                with self._cond:
+                    self.frames_captured += 1
+                    if self._latest is not None and self._latest.seq > self._consumed_seq:
+                        self.frames_dropped += 1  # Overwritten before the consumer got to it
+                    self._latest = CapturedFrame(frame, timestamp, self.frames_captured)
+                    self._cond.notify_all()
+        finally:
+            with self._cond:
+                self._running = False
+                self.ended = True
+                self._cond.notify_all()
+            self.capture.release()
+
+    def read_latest(self, after_seq: int = 0, timeout: Optional[float] = 1.0) -> Optional[CapturedFrame]:
+        """
+        Get the newest frame, waiting for one newer than after_seq.
+
+        Returns:
+            The newest CapturedFrame, or None on timeout or once the source has ended
+        """
+        with self._cond:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while (self._latest is None or self._latest.seq <= after_seq) and not self.ended:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+            if self._latest is None or self._latest.seq <= after_seq:
+                return None
+            self._consumed_seq = self._latest.seq
+            return self._latest
+
+    def get_stats(self) -> Dict:
+        """Get capture statistics."""
+        with self._cond:
+            latest = self._latest
+            return {
+                'frames_captured': self.frames_captured,
+                'frames_dropped': self.frames_dropped,
+                'frames_skipped': self.frames_skipped,
+                'read_failures': self.read_failures,
+                'last_seq': latest.seq if latest else 0,
+                'last_capture_age_ms': round((time.time() - latest.timestamp) * 1000, 1) if latest else None,
+                'ended': self.ended,
+            }
@@ -0,0 +1,88 @@
+"""
+Adaptive Frame Pacing for Live CCTV Analysis
+Closed-loop controller that sets each camera's analysis rate from its measured per-frame processing time
+"""
+
+import threading
+from typing import Dict, Optional
+
+
+class FramePacer:
+    """
+    Per-camera analysis-rate controller.
+
+    The rate is the configured target unless the smoothed processing time says the target
+    cannot be met; then it drops to what the host actually sustains (minus headroom, so one
+    saturated camera does not starve the others) and recovers as processing gets cheaper.
+    """
+
+    def __init__(self, target_fps: float = 30.0, min_fps: float = 1.0, headroom: float = 0.85,
+                 smoothing: float = 0.2):
+        """
+        Args:
+            target_fps: Desired analysis rate
+            min_fps: Never back off below this rate
+            headroom: Fraction of the sustainable rate used when saturated (< 1 leaves CPU slack)
+            smoothing: EWMA weight of the newest processing-time sample
+        """
+        self.min_fps = min_fps
+        self.headroom = headroom
+        self.smoothing = smoothing
+        self.target_fps = max(min_fps, float(target_fps))
+
+        self.processing_s: Optional[float] = None  # EWMA of per-frame processing time
+        self.rate = self.target_fps
+        self.saturated = False
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.frames = 0
+        self.overruns = 0  # Frames whose processing alone exceeded the frame budget
+
+    def set_target(self, target_fps: float) -> None:
+        """Change the target rate (e.g. from /live/settings)."""
+        with self._lock:
+            self.target_fps = max(self.min_fps, float(target_fps))
+            self._update_rate()
+
+    def _update_rate(self) -> None:
+        if self.processing_s:
+            sustainable = 1.0 / self.processing_s
+            self.saturated = sustainable < self.target_fps
+            rate = min(self.target_fps, sustainable * self.headroom) if self.saturated else self.target_fps
+        else:
+            self.saturated = False
+            rate = self.target_fps
+        self.rate = max(self.min_fps, rate)
+
+    def frame_done(self, processing_s: float) -> float:
+        """
+        Record one frame's processing time and get how long to wait before the next frame.
+
+        Returns:
+            Seconds left in this frame's budget at the adapted rate (0 when already over it)
+        """
+        with self._lock:
+            if self.processing_s is None:
+                self.processing_s = processing_s
+            else:
+                self.processing_s += self.smoothing * (processing_s - self.processing_s)
+            self._update_rate()
+
+            budget = 1.0 / self.rate
+            self.frames += 1
+            if processing_s > budget:
+                self.overruns += 1
+            return max(0.0, budget - processing_s)
+
+    def get_stats(self) -> Dict:
+        """Get pacing statistics."""
+        with self._lock:
+            return {
+                'target_fps': round(self.target_fps, 2),
+                'analysis_fps': round(self.rate, 2),
+                'processing_ms': round(self.processing_s * 1000, 2) if self.processing_s else None,
+                'saturated': self.saturated,
+                'overruns': self.overruns,
+                'frames': self.frames,
+            }
@@ -1,7 +1,7 @@
 import { Card, Row, Col, Space, Tag, Button, Skeleton, Typography } from "antd";
 import { PlayCircleOutlined, PauseCircleOutlined } from "@ant-design/icons";
 import { useState, useEffect } from "react";
-import { apiClient } from "../providers/apiClient";
+import { apiClient, API_URL } from "../providers/apiClient";
 
 interface CameraStats {
   frame_count: number;
@@ -21,8 +21,6 @@ interface Props {
 }
 
 export const DualVideoCard = ({ onToggle }: Props) => {
-  const [frame1, setFrame1] = useState<string>("");
-  const [frame2, setFrame2] = useState<string>("");
   const [toggleLoading, setToggleLoading] = useState<Record<number, boolean>>({
     1: false,
     2: false,
@@ -56,31 +54,9 @@ export const DualVideoCard = ({ onToggle }: Props) => {
     return () => clearInterval(interval);
   }, []);
 
-  // Fetch frame from camera 1
-  useEffect(() => {
-    const interval = setInterval(async () => {
-      try {
-        const res = await apiClient.get("/live/dual/frame/1");
-        setFrame1(res.data?.frame || "");
-      } catch (error) {
-        console.error("Error fetching frame 1:", error);
-      }
-    }, 33);
-    return () => clearInterval(interval);
-  }, []);
-
-  // Fetch frame from camera 2
-  useEffect(() => {
-    const interval = setInterval(async () => {
-      try {
-        const res = await apiClient.get("/live/dual/frame/2");
-        setFrame2(res.data?.frame || "");
-      } catch (error) {
-        console.error("Error fetching frame 2:", error);
-      }
-    }, 33);
-    return () => clearInterval(interval);
-  }, []);
+  // MJPEG streams while each camera runs (the browser keeps only the newest frame)
+  const frame1 = stats1.running ? `${API_URL}/live/dual/mjpeg/1?fps=15` : "";
+  const frame2 = stats2.running ? `${API_URL}/live/dual/mjpeg/2?fps=15` : "";
 
   const handleToggle = async (cameraId: number, active: boolean) => {
     setToggleLoading((prev) => ({ ...prev, [cameraId]: true }));
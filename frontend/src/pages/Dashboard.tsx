@@ -4,11 +4,10 @@ import { SidebarSettings } from "../components/SidebarSettings";
 import { LiveVideoCard } from "../components/LiveVideoCard";
 import { MetricsGrid } from "../components/MetricsGrid";
 import { AlertsPanel } from "../components/AlertsPanel";
-import { apiClient } from "../providers/apiClient";
+import { apiClient, API_URL } from "../providers/apiClient";
 
 export const DashboardPage = () => {
   const [stats, setStats] = useState<any>({});
-  const [frame, setFrame] = useState<string>("");
   const [alerts, setAlerts] = useState<any[]>([]);
 
   // Fetch stats every 1s
@@ -24,18 +23,8 @@ export const DashboardPage = () => {
     return () => clearInterval(interval);
   }, []);
 
-  // Fetch frame every 33ms (30fps)
-  useEffect(() => {
-    const interval = setInterval(async () => {
-      try {
-        const res = await apiClient.get("/live/frame");
-        setFrame(res.data?.frame || "");
-      } catch (error) {
-        console.error("Error fetching frame:", error);
-      }
-    }, 33);
-    return () => clearInterval(interval);
-  }, []);
+  // MJPEG stream while the camera runs (the browser keeps only the newest frame)
+  const frame = stats.running ? `${API_URL}/live/mjpeg?fps=15` : "";
 
   // Fetch live alerts every 2s (from persistent storage, not temporary queue)
   useEffect(() => {
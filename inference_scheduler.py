@@ -0,0 +1,216 @@
+"""
+Cross-Camera Batched Inference for CCTV Weapon Detection
+Collects pending frames from every registered detector and runs them through one ONNX call
+"""
+
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+class BatchInferenceScheduler:
+    """Shares one ONNX session between cameras and batches their frames per run."""
+
+    def __init__(self, session, device: str = "CPU", max_batch: int = 8, max_wait_ms: float = 10.0):
+        """
+        Initialize the scheduler around an already loaded session.
+
+        Args:
+            session: onnxruntime InferenceSession (or None if the model failed to load)
+            device: Human readable device label reported by detectors
+            max_batch: Maximum number of images stacked into one session.run call
+            max_wait_ms: Longest time the first queued frame waits for others to join
+        """
+        self.session = session
+        self.device = device
+        self.max_batch = max(1, int(max_batch))
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+
+        self.input_name = session.get_inputs()[0].name if session else None
+        self.output_name = session.get_outputs()[0].name if session else None
+
+        # Exported YOLO models often have a static batch dimension of 1
+        batch_dim = session.get_inputs()[0].shape[0] if session else 1
+        self.supports_batching = not isinstance(batch_dim, int) or batch_dim > 1
+        if isinstance(batch_dim, int) and batch_dim > 1:
+            self.max_batch = min(self.max_batch, batch_dim)
+
+        self._pending: List[Tuple[np.ndarray, Future]] = []
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._clients = 0
+
+        # Statistics
+        self.batches_run = 0
+        self.images_run = 0
+        self.last_batch_size = 0
+        self.last_inference_ms = 0.0
+
+    def register(self) -> None:
+        """Register a camera so batches can close as soon as every camera has submitted."""
+        with self._cond:
+            self._clients += 1
+
+    def unregister(self) -> None:
+        """Remove a camera registered with register()."""
+        with self._cond:
+            self._clients = max(0, self._clients - 1)
+            # The batch being held open may have been waiting only for this camera
+            self._cond.notify_all()
+
+    def start(self) -> None:
+        """Start the batching thread (called lazily on first submit)."""
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the batching thread and fail any frames still waiting."""
+        with self._cond:
+            self._running = False
+            pending, self._pending = self._pending, []
+            self._cond.notify_all()
+        for _, future in pending:
+            if future.set_running_or_notify_cancel():
+                future.set_exception(RuntimeError("Inference scheduler stopped"))
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=2)
+        self._thread = None
+
+    def submit(self, tensor: np.ndarray) -> Future:
+        """
+        Queue a preprocessed input tensor for the next batch.
+
+        Args:
+            tensor: Float32 array shaped [N, 3, H, W] (N is usually 1)
+
+        Returns:
+            Future resolving to the model output rows for this tensor ([N, ...])
+        """
+        future: Future = Future()
+        if self.session is None:
+            future.set_exception(RuntimeError("ONNX session not available"))
+            return future
+
+        if not self._running:
+            self.start()
+
+        with self._cond:
+            self._pending.append((tensor, future))
+            self._cond.notify_all()
+        return future
+
+    def infer(self, tensor: np.ndarray, timeout: Optional[float] = 5.0) -> np.ndarray:
+        """
+        Submit a tensor and block until its output rows are available.
+
+        Raises:
+            concurrent.futures.TimeoutError: If no result arrived in time (the request is withdrawn)
+        """
+        future = self.submit(tensor)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            # Don't leave the tensor queued for a caller that has given up on it
+            with self._cond:
+                self._pending = [item for item in self._pending if item[1] is not future]
+            future.cancel()
+            raise
+
+    def _pending_images(self) -> int:
+        return sum(t.shape[0] for t, _ in self._pending)
+
+    def _batch_ready(self) -> bool:
+        if self._pending_images() >= self.max_batch:
+            return True
+        # Every registered camera already has a frame queued: nobody else is coming
+        return self._clients > 0 and len(self._pending) >= self._clients
+
+    def _take_batch(self) -> List[Tuple[np.ndarray, Future]]:
+        """Pop queued requests up to max_batch images (cancelled requests are dropped)."""
+        batch = []
+        count = 0
+        while self._pending:
+            rows = self._pending[0][0].shape[0]
+            if batch and count + rows > self.max_batch:
+                break
+            tensor, future = self._pending.pop(0)
+            # Marks the future running, so a late cancel() can no longer race the result
+            if not future.set_running_or_notify_cancel():
+                continue
+            batch.append((tensor, future))
+            count += rows
+        return batch
+
+    def _run(self) -> None:
+        """Batching loop: wait for the batch to fill or the deadline to pass, then run once."""
+        while True:
+            with self._cond:
+                while self._running and not self._pending:
+                    self._cond.wait()
+                if not self._running:
+                    return
+
+                deadline = time.monotonic() + self.max_wait
+                while self._running and not self._batch_ready():
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+
+                batch = self._take_batch()
+
+            if batch:
+                self._run_batch(batch)
+
+    def _run_batch(self, batch: List[Tuple[np.ndarray, Future]]) -> None:
+        """Run one batch through the session and scatter rows back to each future."""
+        start = time.time()
+        try:
+            if self.supports_batching:
+                stacked = np.concatenate([t for t, _ in batch], axis=0) if len(batch) > 1 else batch[0][0]
+                output = self.session.run([self.output_name], {self.input_name: stacked})[0]
+            else:
+                # Static batch dimension: still share the session, run images one by one
+                output = np.concatenate([
+                    self.session.run([self.output_name], {self.input_name: t[i:i + 1]})[0]
+                    for t, _ in batch for i in range(t.shape[0])
+                ], axis=0)
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        self.last_inference_ms = (time.time() - start) * 1000
+        self.last_batch_size = int(output.shape[0])
+        self.batches_run += 1
+        self.images_run += self.last_batch_size
+
+        offset = 0
+        for tensor, future in batch:
+            rows = tensor.shape[0]
+            future.set_result(output[offset:offset + rows])
+            offset += rows
+
+    def get_stats(self) -> Dict:
+        """Get batching statistics."""
+        with self._cond:
+            queued = len(self._pending)
+            clients = self._clients
+        return {
+            'registered_cameras': clients,
+            'queued_requests': queued,
+            'batches_run': self.batches_run,
+            'images_run': self.images_run,
+            'average_batch_size': round(self.images_run / self.batches_run, 2) if self.batches_run else 0.0,
+            'last_batch_size': self.last_batch_size,
+            'last_inference_ms': round(self.last_inference_ms, 2),
+            'supports_batching': self.supports_batching,
+        }
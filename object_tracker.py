@@ -0,0 +1,186 @@
+"""
+Lightweight Multi-Object Tracker for CCTV Weapon Detections
+SORT-style constant-velocity Kalman tracks with IoU association, pure NumPy
+"""
+
+from typing import Dict, List
+
+import numpy as np
+
+
+def box_iou_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """IoU between every box in a (N, 4) and every box in b (M, 4), as an (N, M) matrix."""
+    if len(a) == 0 or len(b) == 0:
+        return np.zeros((len(a), len(b)), dtype=np.float64)
+    xx1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    yy1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    xx2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    yy2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = np.clip(xx2 - xx1, 0, None) * np.clip(yy2 - yy1, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    return inter / (area_a[:, None] + area_b[None, :] - inter + 1e-6)
+
+
+class KalmanBoxTrack:
+    """One tracked box with a constant-velocity Kalman filter over [cx, cy, w, h]."""
+
+    # State transition (x += v each frame) and measurement matrices, shared by all tracks
+    F = np.eye(8)
+    F[:4, 4:] = np.eye(4)
+    H = np.eye(4, 8)
+
+    def __init__(self, track_id: int, box: np.ndarray, confidence: float):
+        self.track_id = track_id
+        self.confidence = confidence
+        self.hits = 1
+        self.misses = 0              # Inference updates in a row without a matching detection
+        self.frames_since_update = 0
+
+        self.x = np.zeros(8)
+        self.x[:4] = self._to_state(box)
+        self.P = np.diag([10.0, 10.0, 10.0, 10.0, 100.0, 100.0, 100.0, 100.0])
+        self.Q = np.diag([1.0, 1.0, 1.0, 1.0, 0.5, 0.5, 0.25, 0.25])
+        self.R = np.diag([4.0, 4.0, 10.0, 10.0])
+
+    @staticmethod
+    def _to_state(box: np.ndarray) -> np.ndarray:
+        x1, y1, x2, y2 = box
+        return np.array([(x1 + x2) / 2, (y1 + y2) / 2, x2 - x1, y2 - y1], dtype=np.float64)
+
+    @property
+    def box(self) -> np.ndarray:
+        """Current [x1, y1, x2, y2] estimate."""
+        cx, cy, w, h = self.x[:4]
+        w, h = max(w, 1.0), max(h, 1.0)
+        return np.array([cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2])
+
+    @property
+    def position_std(self) -> float:
+        """Standard deviation of the centre estimate in pixels."""
+        return float(np.sqrt(max(self.P[0, 0], self.P[1, 1])))
+
+    def predict(self) -> None:
+        """Propagate the track one frame forward."""
+        self.x = self.F @ self.x
+        self.P = self.F @ self.P @ self.F.T + self.Q
+        self.frames_since_update += 1
+
+    def update(self, box: np.ndarray, confidence: float) -> None:
+        """Correct the track with a matched detection."""
+        y = self._to_state(box) - self.H @ self.x
+        S = self.H @ self.P @ self.H.T + self.R
+        K = self.P @ self.H.T @ np.linalg.inv(S)
+        self.x = self.x + K @ y
+        self.P = (np.eye(8) - K @ self.H) @ self.P
+        self.confidence = confidence
+        self.hits += 1
+        self.misses = 0
+        self.frames_since_update = 0
+
+
+class WeaponTracker:
+    """Keeps stable IDs for weapon boxes and propagates them between inference frames."""
+
+    def __init__(self, iou_threshold: float = 0.3, max_misses: int = 2,
+                 min_confirm_hits: int = 2, max_uncertainty_px: float = 20.0):
+        """
+        Args:
+            iou_threshold: Minimum IoU between a predicted track and a detection to match them
+            max_misses: Inference frames a track may go unmatched before it is dropped
+            min_confirm_hits: Detections needed before a track is trusted between inference frames
+            max_uncertainty_px: Position std above which a track asks for fresh inference
+        """
+        self.iou_threshold = iou_threshold
+        self.max_misses = max_misses
+        self.min_confirm_hits = min_confirm_hits
+        self.max_uncertainty_px = max_uncertainty_px
+
+        self.tracks: List[KalmanBoxTrack] = []
+        self._next_id = 1
+
+    def reset(self) -> None:
+        """Drop every track (IDs keep increasing)."""
+        self.tracks = []
+
+    def is_uncertain(self) -> bool:
+        """True if any track is unconfirmed or has drifted too far to propagate without inference."""
+        return any(
+            t.hits < self.min_confirm_hits or t.position_std > self.max_uncertainty_px
+            for t in self.tracks
+        )
+
+    def update(self, detections: List[Dict]) -> List[Dict]:
+        """
+        Associate fresh detections with tracks (greedy highest-IoU first).
+
+        Args:
+            detections: Detection dicts with 'box' and 'confidence'
+
+        Returns:
+            The same detections, each tagged with 'track_id' and 'tracked': False
+        """
+        for track in self.tracks:
+            track.predict()
+
+        boxes = np.array([d['box'] for d in detections], dtype=np.float64).reshape(-1, 4)
+        predicted = np.array([t.box for t in self.tracks], dtype=np.float64).reshape(-1, 4)
+        iou = box_iou_matrix(predicted, boxes)
+
+        matched_tracks = set()
+        matched_dets = {}
+        if iou.size:
+            order = np.argsort(-iou, axis=None)
+            for flat in order:
+                ti, di = np.unravel_index(flat, iou.shape)
+                if iou[ti, di] < self.iou_threshold:
+                    break
+                if ti in matched_tracks or di in matched_dets:
+                    continue
+                matched_tracks.add(ti)
+                matched_dets[di] = ti
+
+        results = []
+        for di, det in enumerate(detections):
+            if di in matched_dets:
+                track = self.tracks[matched_dets[di]]
+                track.update(boxes[di], det['confidence'])
+            else:
+                track = KalmanBoxTrack(self._next_id, boxes[di], det['confidence'])
+                self._next_id += 1
+                self.tracks.append(track)
+            results.append({**det, 'track_id': track.track_id, 'tracked': False})
+
+        for ti, track in enumerate(self.tracks):
+            if ti not in matched_tracks and track.frames_since_update > 0:
+                track.misses += 1
+        self.tracks = [t for t in self.tracks if t.misses <= self.max_misses]
+
+        return results
+
+    def predict(self, frame_shape) -> List[Dict]:
+        """
+        Propagate confirmed tracks one frame without running inference.
+
+        Returns:
+            Detection dicts for the predicted boxes, clipped to the frame, with 'tracked': True
+        """
+        h, w = frame_shape[:2]
+        results = []
+        for track in self.tracks:
+            track.predict()
+            if track.hits < self.min_confirm_hits:
+                continue
+            x1, y1, x2, y2 = track.box
+            x1, x2 = int(np.clip(x1, 0, w)), int(np.clip(x2, 0, w))
+            y1, y2 = int(np.clip(y1, 0, h)), int(np.clip(y2, 0, h))
+            if x2 <= x1 or y2 <= y1:
+                continue
+            results.append({
+                'box': (x1, y1, x2, y2),
+                'confidence': float(track.confidence),
+                'class': 'weapon',
+                'track_id': track.track_id,
+                'tracked': True
+            })
+        return results
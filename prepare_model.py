@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Weapon Model Preparation
+Builds an optimized ORT-format model and INT8 quantized variants, then reports
+startup time, latency and detection agreement against the FP32 model
+
+Usage:
+    python prepare_model.py --model normal.onnx --samples alerts/images --out-dir models
+    python prepare_model.py --model normal.onnx --samples clip.mp4 --max-samples 100
+
+Quantization needs the `onnx` package (pip install onnx).
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import cv2
+import numpy as np
+import onnxruntime as rt
+
+from cctv_detector import CCTVCrimeDetector, LetterboxPreprocessor
+from object_tracker import box_iou_matrix
+
+
+IMAGE_SUFFIXES = (".jpg", ".jpeg", ".png", ".bmp")
+VIDEO_SUFFIXES = (".mp4", ".avi", ".mov", ".mkv", ".flv", ".wmv")
+
+
+def load_sample_frames(sources: List[str], max_samples: int) -> List[np.ndarray]:
+    """Read calibration/report frames from image folders, image files or videos."""
+    frames: List[np.ndarray] = []
+    for source in sources:
+        path = Path(source)
+        files = sorted(p for p in path.iterdir()) if path.is_dir() else [path]
+        for file in files:
+            if len(frames) >= max_samples:
+                return frames
+            suffix = file.suffix.lower()
+            if suffix in IMAGE_SUFFIXES:
+                frame = cv2.imread(str(file))
+                if frame is not None:
+                    frames.append(frame)
+            elif suffix in VIDEO_SUFFIXES:
+                capture = cv2.VideoCapture(str(file))
+                total = int(capture.get(cv2.CAP_PROP_FRAME_COUNT)) or max_samples
+                step = max(1, total // max(1, max_samples - len(frames)))
+                index = 0
+                while len(frames) < max_samples:
+                    ret, frame = capture.read()
+                    if not ret:
+                        break
+                    if index % step == 0:
+                        frames.append(frame)
+                    index += 1
+                capture.release()
+    return frames
+
+
+def optimize_to_ort(model_path: Path, output_path: Path) -> Path:
+    """Apply extended graph optimizations once and save the result in ORT format."""
+    options = rt.SessionOptions()
+    # Extended (not "all"): layout optimizations baked in by ENABLE_ALL are CPU-specific
+    options.graph_optimization_level = rt.GraphOptimizationLevel.ORT_ENABLE_EXTENDED
+    options.optimized_model_filepath = str(output_path)
+    options.add_session_config_entry("session.save_model_format", "ORT")
+    rt.InferenceSession(str(model_path), sess_options=options, providers=["CPUExecutionProvider"])
+    return output_path
+
+
+def quantize_dynamic_int8(model_path: Path, output_path: Path) -> Path:
+    """INT8 weights, activations quantized on the fly (no calibration needed)."""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    quantize_dynamic(str(model_path), str(output_path), weight_type=QuantType.QInt8)
+    return output_path
+
+
+def quantize_static_int8(model_path: Path, output_path: Path, frames: List[np.ndarray]) -> Path:
+    """INT8 weights and activations (QDQ), with activation ranges calibrated on sample frames."""
+    from onnxruntime.quantization import CalibrationDataReader, QuantFormat, QuantType, quantize_static
+
+    session = rt.InferenceSession(str(model_path), providers=["CPUExecutionProvider"])
+    input_name = session.get_inputs()[0].name
+    preprocessor = LetterboxPreprocessor(640)
+
+    class FrameCalibrationReader(CalibrationDataReader):
+        """Feeds letterboxed sample frames exactly as the detector preprocesses them."""
+
+        def __init__(self):
+            self._frames = iter(frames)
+
+        def get_next(self) -> Optional[Dict[str, np.ndarray]]:
+            frame = next(self._frames, None)
+            if frame is None:
+                return None
+            tensor, _, _ = preprocessor(frame)
+            return {input_name: tensor.copy()}
+
+    quantize_static(
+        str(model_path), str(output_path), FrameCalibrationReader(),
+        quant_format=QuantFormat.QDQ,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8,
+        per_channel=True,
+    )
+    return output_path
+
+
+def detection_agreement(reference: np.ndarray, candidate: np.ndarray, iou_threshold: float = 0.5) -> float:
+    """F1-style agreement between two WEAPON_DTYPE arrays (1.0 when both are empty)."""
+    if len(reference) == 0 and len(candidate) == 0:
+        return 1.0
+    if len(reference) == 0 or len(candidate) == 0:
+        return 0.0
+
+    def boxes(w):
+        return np.stack([w['x1'], w['y1'], w['x2'], w['y2']], axis=1).astype(np.float64)
+
+    iou = box_iou_matrix(boxes(reference), boxes(candidate))
+    matched = 0
+    used = set()
+    for i in range(len(reference)):
+        for j in np.argsort(-iou[i]):
+            if iou[i, j] < iou_threshold:
+                break
+            if j not in used:
+                used.add(j)
+                matched += 1
+                break
+    return 2 * matched / (len(reference) + len(candidate))
+
+
+def profile_model(model_path: Path, frames: List[np.ndarray]) -> Dict:
+    """Startup time, per-frame latency, raw confidences and decoded detections for one artifact."""
+    start = time.perf_counter()
+    detector = CCTVCrimeDetector(str(model_path), use_gpu=False, person_model="edges")
+    startup_ms = (time.perf_counter() - start) * 1000
+    if detector.session is None:
+        raise RuntimeError(f"Could not load {model_path}")
+
+    latencies, confidences, detections = [], [], []
+    for frame in frames:
+        start = time.perf_counter()
+        tensor, scale, offset = detector.preprocess_for_cctv(frame)
+        output = detector._run_model(tensor)
+        weapons = detector.decode_weapon_output(output, frame.shape, scale, offset)
+        latencies.append((time.perf_counter() - start) * 1000)
+        confidences.append(output[0, 4].copy())
+        detections.append(weapons)
+
+    return {
+        "startup_ms": startup_ms,
+        "latencies": latencies,
+        "confidences": confidences,
+        "detections": detections,
+        "size_mb": model_path.stat().st_size / (1024 * 1024),
+    }
+
+
+def build_report(artifacts: Dict[str, Path], frames: List[np.ndarray]) -> Dict:
+    """Compare every artifact against the FP32 model."""
+    profiles = {name: profile_model(path, frames) for name, path in artifacts.items()}
+    reference = profiles["fp32"]
+
+    report = {}
+    for name, profile in profiles.items():
+        # First frame includes lazy allocations; leave it out of the latency figures
+        latencies = np.array(profile["latencies"][1:] or profile["latencies"])
+        conf_mae = float(np.mean([
+            np.mean(np.abs(a - b)) for a, b in zip(reference["confidences"], profile["confidences"])
+        ]))
+        agreement = float(np.mean([
+            detection_agreement(a, b) for a, b in zip(reference["detections"], profile["detections"])
+        ]))
+        report[name] = {
+            "path": str(artifacts[name]),
+            "size_mb": round(profile["size_mb"], 2),
+            "startup_ms": round(profile["startup_ms"], 1),
+            "latency_mean_ms": round(float(latencies.mean()), 2),
+            "latency_p95_ms": round(float(np.percentile(latencies, 95)), 2),
+            "speedup": round(float(np.mean(reference["latencies"][1:] or reference["latencies"]) / latencies.mean()), 2),
+            "confidence_mae": round(conf_mae, 5),
+            "detection_agreement": round(agreement, 4),
+            "detections": int(sum(len(d) for d in profile["detections"])),
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prepare optimized and INT8 weapon models")
+    parser.add_argument("--model", default="normal.onnx", help="FP32 ONNX model")
+    parser.add_argument("--samples", nargs="*", default=[], help="Image folders, images or videos for calibration/report")
+    parser.add_argument("--max-samples", type=int, default=64)
+    parser.add_argument("--out-dir", default="models")
+    parser.add_argument("--report", default=None, help="Report JSON path (default: <out-dir>/model_report.json)")
+    parser.add_argument("--skip-quantization", action="store_true")
+    args = parser.parse_args()
+
+    model_path = Path(args.model)
+    out_dir = Path(args.out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    stem = model_path.stem
+
+    frames = load_sample_frames(args.samples, args.max_samples)
+    if not frames:
+        print("⚠️ No sample frames given: static quantization skipped, report uses random frames")
+        rng = np.random.default_rng(0)
+        frames = [(rng.random((480, 640, 3)) * 255).astype(np.uint8) for _ in range(8)]
+        calibrate = False
+    else:
+        print(f"📷 Loaded {len(frames)} sample frames")
+        calibrate = True
+
+    artifacts: Dict[str, Path] = {"fp32": model_path}
+
+    print("⚙️ Optimizing graph to ORT format...")
+    artifacts["optimized_ort"] = optimize_to_ort(model_path, out_dir / f"{stem}.opt.ort")
+
+    if not args.skip_quantization:
+        try:
+            print("⚙️ Dynamic INT8 quantization...")
+            artifacts["int8_dynamic"] = quantize_dynamic_int8(model_path, out_dir / f"{stem}.int8_dynamic.onnx")
+            if calibrate:
+                print("⚙️ Static INT8 quantization (calibrating)...")
+                artifacts["int8_static"] = quantize_static_int8(model_path, out_dir / f"{stem}.int8_static.onnx", frames)
+        except ImportError as e:
+            print(f"⚠️ Quantization unavailable ({e}); install with: pip install onnx")
+
+    print("📊 Profiling artifacts...")
+    report = build_report(artifacts, frames)
+
+    report_path = Path(args.report) if args.report else out_dir / "model_report.json"
+    with open(report_path, "w") as f:
+        json.dump({"model": str(model_path), "samples": len(frames), "artifacts": report}, f, indent=2)
+
+    print("\n" + "=" * 96)
+    print(f"{'artifact':<15} {'size MB':>8} {'startup ms':>11} {'mean ms':>9} {'p95 ms':>9} {'speedup':>8} {'conf MAE':>10} {'agreement':>10}")
+    print("=" * 96)
+    for name, row in report.items():
+        print(f"{name:<15} {row['size_mb']:>8.2f} {row['startup_ms']:>11.1f} {row['latency_mean_ms']:>9.2f} "
+              f"{row['latency_p95_ms']:>9.2f} {row['speedup']:>7.2f}x {row['confidence_mae']:>10.5f} {row['detection_agreement']:>9.1%}")
+    print(f"\n✅ Report saved to {report_path}")
+    print(f"   Use an artifact with: GUN_MODEL_PATH={artifacts.get('int8_static', artifacts['optimized_ort'])}")
+
+
+if __name__ == "__main__":
+    main()
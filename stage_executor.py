@@ -0,0 +1,92 @@
+"""
+Parallel Stage Executor for CCTV Detection
+Runs independent detector stages (weapon inference, optical flow, clustering) concurrently
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import cv2
+
+
+def default_thread_budget(parallel_stages: int = 3) -> Dict[str, int]:
+    """
+    Split the host's cores between concurrently running stages.
+
+    Each stage's native code (OpenCV, ONNX Runtime) gets roughly cores / parallel_stages
+    threads so running the stages side by side does not oversubscribe the CPU.
+    """
+    cores = os.cpu_count() or 1
+    per_stage = max(1, cores // max(1, parallel_stages))
+    return {
+        # Shared by all cameras; each camera thread also runs one of its stages itself
+        "stage_workers": max(parallel_stages - 1, cores // 2),
+        "opencv_threads": per_stage,
+        "ort_intra_op_threads": per_stage,
+    }
+
+
+class StageExecutor:
+    """Small thread pool that runs a frame's independent stages concurrently (shareable between cameras)."""
+
+    def __init__(self, max_workers: int = 2, opencv_threads: Optional[int] = None):
+        """
+        Args:
+            max_workers: Pool threads; the calling thread always runs the first stage itself
+            opencv_threads: Process-wide OpenCV thread budget (None leaves OpenCV's default)
+        """
+        self.max_workers = max(1, int(max_workers))
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="stage")
+
+        self.opencv_threads = opencv_threads
+        if opencv_threads is not None:
+            cv2.setNumThreads(int(opencv_threads))
+
+    def run(self, stages: List[Tuple[str, Callable[[], Any]]]) -> Tuple[Dict[str, Any], Dict[str, float]]:
+        """
+        Run stages concurrently and wait for all of them.
+
+        Stages must not share mutable state. Results are keyed by stage name, so merging
+        them is independent of completion order. The first exception raised by a stage
+        (in list order) is re-raised after every stage has finished.
+
+        Returns:
+            Tuple of (results by name, wall time in ms by name)
+        """
+        timings: Dict[str, float] = {}
+
+        def timed(name: str, fn: Callable[[], Any]) -> Any:
+            start = time.perf_counter()
+            try:
+                return fn()
+            finally:
+                timings[name] = (time.perf_counter() - start) * 1000
+
+        if not stages:
+            return {}, timings
+
+        futures = [(name, self._pool.submit(timed, name, fn)) for name, fn in stages[1:]]
+
+        results: Dict[str, Any] = {}
+        error: Optional[BaseException] = None
+        first_name, first_fn = stages[0]
+        try:
+            results[first_name] = timed(first_name, first_fn)
+        except BaseException as e:
+            error = e
+
+        for name, future in futures:
+            try:
+                results[name] = future.result()
+            except BaseException as e:
+                error = error or e
+
+        if error is not None:
+            raise error
+        return results, timings
+
+    def shutdown(self) -> None:
+        """Stop the pool threads."""
+        self._pool.shutdown(wait=True)
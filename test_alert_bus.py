@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Test AlertBus cursors and missed counts once the ring buffer has wrapped."""
+
+import pytest
+
+from backend.alert_bus import AlertBus
+
+
+def publish(bus: AlertBus, count: int, camera_id: str = "cam") -> None:
+    for n in range(count):
+        bus.publish({"n": n}, camera_id=camera_id)
+
+
+def test_reader_behind_more_than_capacity():
+    """A reader that fell behind skips to the oldest buffered event and is told how many it lost."""
+    bus = AlertBus(capacity=5)
+    publish(bus, 12)  # Ids 1-12; 8-12 are still buffered
+
+    read = bus.read(2)
+    assert [event.id for event in read.events] == [8, 9, 10, 11, 12]
+    assert read.missed == 5  # Ids 3-7
+    assert read.cursor == 12
+
+    again = bus.read(read.cursor)
+    assert again.events == [] and again.missed == 0 and again.cursor == 12
+
+
+def test_reader_at_head():
+    """A reader that has seen the newest event gets nothing, including from a cursor ahead of the bus."""
+    bus = AlertBus(capacity=5)
+    publish(bus, 12)
+
+    for after_id in (12, 40):
+        read = bus.read(after_id)
+        assert read.events == [] and read.missed == 0
+        assert read.cursor == 12
+
+    bus.publish({"n": 12}, camera_id="cam")
+    assert [event.id for event in bus.read(12).events] == [13]
+
+
+def test_since_zero():
+    """since=0 returns the whole buffer; once wrapped, everything older counts as missed."""
+    bus = AlertBus(capacity=5)
+    publish(bus, 3)
+    read = bus.read(0)
+    assert [event.id for event in read.events] == [1, 2, 3]
+    assert read.missed == 0
+
+    publish(bus, 9)  # Ids 4-12; 8-12 are still buffered
+    read = bus.read(0)
+    assert [event.id for event in read.events] == [8, 9, 10, 11, 12]
+    assert read.missed == 7
+    assert read.cursor == 12
+
+
+def test_cursor_moves_past_other_cameras_and_limit():
+    """Filtered reads advance over other cameras' events; a limit stops at the last event returned."""
+    bus = AlertBus(capacity=10)
+    for n in range(6):
+        bus.publish({"n": n}, camera_id="a" if n % 2 else "b")  # Ids 1-6; "a" has 2, 4, 6
+
+    read = bus.read(0, camera_id="a", limit=2)
+    assert [event.id for event in read.events] == [2, 4]
+    assert read.cursor == 4
+
+    read = bus.read(read.cursor, camera_id="a")
+    assert [event.id for event in read.events] == [6]
+    assert read.cursor == 6
+
+
+def test_capacity_must_be_positive():
+    with pytest.raises(ValueError):
+        AlertBus(capacity=0)
+
+
+if __name__ == "__main__":
+    test_reader_behind_more_than_capacity()
+    test_reader_at_head()
+    test_since_zero()
+    test_cursor_moves_past_other_cameras_and_limit()
+    test_capacity_must_be_positive()
+    print("✅ Alert bus cursors and missed counts after wrap-around")
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Test the JSON Lines daily alert logs: legacy migration, torn lines and compaction."""
+
+import json
+import tempfile
+from pathlib import Path
+
+from alert_logger import (
+    AlertLogger,
+    _append_daily_log,
+    compact_daily_log,
+    iter_daily_log,
+    migrate_daily_logs,
+)
+
+
+def make_entry(n: int, hour: int = 10) -> dict:
+    return {
+        "alert_id": f"CRIME_20260101_{hour:02d}0000_{n:03d}",
+        "timestamp": f"2026-01-01T{hour:02d}:00:00.{n:03d}",
+        "alert_type": "CRIME",
+        "threat_score": 0.5,
+    }
+
+
+def make_logs_dir() -> Path:
+    logs_dir = Path(tempfile.mkdtemp()) / "daily_logs"
+    logs_dir.mkdir()
+    return logs_dir
+
+
+def test_migrate_legacy_array():
+    """A legacy JSON array becomes a sorted JSONL log, merged with entries already appended."""
+    logs_dir = make_logs_dir()
+    legacy = [make_entry(2), make_entry(1)]
+    (logs_dir / "20260101_alerts.json").write_text(json.dumps(legacy), encoding="utf-8")
+    _append_daily_log(logs_dir / "20260101_alerts.jsonl", [make_entry(3)])
+
+    assert migrate_daily_logs(logs_dir) == 1
+
+    entries = list(iter_daily_log(logs_dir / "20260101_alerts.jsonl"))
+    assert [e["alert_id"] for e in entries] == [make_entry(n)["alert_id"] for n in (1, 2, 3)]
+    assert not (logs_dir / "20260101_alerts.json").exists()
+    assert (logs_dir / "20260101_alerts.json.migrated").exists()
+
+
+def test_migrate_twice_is_noop():
+    """A second migration finds nothing to convert and leaves the JSONL log untouched."""
+    logs_dir = make_logs_dir()
+    (logs_dir / "20260101_alerts.json").write_text(json.dumps([make_entry(1)]), encoding="utf-8")
+    assert migrate_daily_logs(logs_dir) == 1
+    log_file = logs_dir / "20260101_alerts.jsonl"
+    before = log_file.read_bytes()
+
+    assert migrate_daily_logs(logs_dir) == 0
+    assert log_file.read_bytes() == before
+
+
+def test_torn_last_line_is_skipped():
+    """A crash mid-append loses only the torn line; the rest of the day still reads and appends."""
+    alert_dir = Path(tempfile.mkdtemp()) / "alerts"
+    logger = AlertLogger(str(alert_dir))
+    log_file = logger.daily_logs_dir / "20260101_alerts.jsonl"
+    _append_daily_log(log_file, [make_entry(1), make_entry(2)])
+    with open(log_file, "a", encoding="utf-8") as f:
+        f.write(json.dumps(make_entry(3))[:25])  # No newline: the write was cut off
+
+    assert [e["alert_id"] for e in iter_daily_log(log_file)] == [make_entry(n)["alert_id"] for n in (1, 2)]
+    assert logger.get_alert_summary("20260101")["total_alerts"] == 2
+
+    # The next append starts on a fresh line instead of extending the torn one
+    _append_daily_log(log_file, [make_entry(4)])
+    assert [e["alert_id"] for e in iter_daily_log(log_file)] == [make_entry(n)["alert_id"] for n in (1, 2, 4)]
+
+
+def test_compaction_keeps_every_record():
+    """Compaction drops torn lines and duplicate ids only, and sorts by timestamp."""
+    logs_dir = make_logs_dir()
+    log_file = logs_dir / "20260101_alerts.jsonl"
+    entries = [make_entry(n, hour=23 - n % 5) for n in range(50)]
+    for start in range(0, 50, 7):
+        _append_daily_log(log_file, entries[start:start + 7])
+    _append_daily_log(log_file, [entries[10]])  # Duplicate (e.g. a retried write)
+    with open(log_file, "a", encoding="utf-8") as f:
+        f.write('{"alert_id": "torn')
+
+    assert compact_daily_log(log_file) == 50
+
+    compacted = list(iter_daily_log(log_file))
+    assert sorted(e["alert_id"] for e in compacted) == sorted(e["alert_id"] for e in entries)
+    timestamps = [e["timestamp"] for e in compacted]
+    assert timestamps == sorted(timestamps)
+    assert log_file.read_text(encoding="utf-8").endswith("\n")
+
+
+if __name__ == "__main__":
+    test_migrate_legacy_array()
+    test_migrate_twice_is_noop()
+    test_torn_last_line_is_skipped()
+    test_compaction_keeps_every_record()
+    print("✅ Daily log migration, torn-line handling and compaction")
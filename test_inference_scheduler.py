@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Test cross-camera batching: when batches close, and timed-out or unregistered requests."""
+
+import threading
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+import numpy as np
+import pytest
+
+from inference_scheduler import BatchInferenceScheduler
+
+
+class FakeInput:
+    def __init__(self, name, shape):
+        self.name = name
+        self.shape = shape
+
+
+class FakeSession:
+    """Dynamic-batch model that echoes each image's first pixel; can be held to keep a batch running."""
+
+    def __init__(self):
+        self.batches = []  # First pixel of every image, per session.run call
+        self.release = threading.Event()
+        self.release.set()
+        self.started = threading.Event()
+
+    def get_inputs(self):
+        return [FakeInput("images", ["batch", 1, 2, 2])]
+
+    def get_outputs(self):
+        return [FakeInput("output0", None)]
+
+    def run(self, output_names, feeds):
+        batch = feeds["images"]
+        self.batches.append([float(v) for v in batch[:, 0, 0, 0]])
+        self.started.set()
+        self.release.wait(5)
+        return [batch[:, 0, 0, :1].copy()]
+
+
+def image(value: float) -> np.ndarray:
+    return np.full((1, 1, 2, 2), value, dtype=np.float32)
+
+
+def test_batch_closes_at_max_batch():
+    """A full batch runs at once instead of waiting out max_wait."""
+    session = FakeSession()
+    scheduler = BatchInferenceScheduler(session, max_batch=4, max_wait_ms=5000)
+    try:
+        start = time.monotonic()
+        futures = [scheduler.submit(image(n)) for n in range(4)]
+        results = [future.result(timeout=2) for future in futures]
+        assert time.monotonic() - start < 2
+        assert session.batches == [[0.0, 1.0, 2.0, 3.0]]
+        assert [float(r[0, 0]) for r in results] == [0.0, 1.0, 2.0, 3.0]
+    finally:
+        scheduler.stop()
+
+
+def test_batch_closes_at_max_wait():
+    """A lone request runs once max_wait has passed."""
+    session = FakeSession()
+    scheduler = BatchInferenceScheduler(session, max_batch=4, max_wait_ms=50)
+    try:
+        start = time.monotonic()
+        result = scheduler.infer(image(7), timeout=2)
+        elapsed = time.monotonic() - start
+        assert 0.04 <= elapsed < 1.0, elapsed
+        assert float(result[0, 0]) == 7.0
+        assert session.batches == [[7.0]]
+    finally:
+        scheduler.stop()
+
+
+def test_timed_out_request_is_never_run():
+    """infer() withdraws a request it gave up on; later batches don't include it."""
+    session = FakeSession()
+    scheduler = BatchInferenceScheduler(session, max_batch=4, max_wait_ms=0)
+    try:
+        session.release.clear()
+        first = scheduler.submit(image(1))
+        assert session.started.wait(2)  # Batch [1] is now running and held
+
+        with pytest.raises(FutureTimeoutError):
+            scheduler.infer(image(2), timeout=0.05)
+        assert scheduler.get_stats()["queued_requests"] == 0
+
+        session.release.set()
+        assert float(first.result(timeout=2)[0, 0]) == 1.0
+        assert float(scheduler.infer(image(3), timeout=2)[0, 0]) == 3.0
+        assert session.batches == [[1.0], [3.0]]
+    finally:
+        scheduler.stop()
+
+
+def test_unregister_while_pending_closes_batch():
+    """When the camera being waited for goes away, the queued frames run without waiting out max_wait."""
+    session = FakeSession()
+    scheduler = BatchInferenceScheduler(session, max_batch=8, max_wait_ms=5000)
+    try:
+        scheduler.register()
+        scheduler.register()
+        future = scheduler.submit(image(5))
+        time.sleep(0.05)
+        assert not future.done()  # Waiting for the second camera's frame
+
+        start = time.monotonic()
+        scheduler.unregister()
+        assert float(future.result(timeout=2)[0, 0]) == 5.0
+        assert time.monotonic() - start < 1.0
+    finally:
+        scheduler.stop()
+
+
+if __name__ == "__main__":
+    test_batch_closes_at_max_batch()
+    test_batch_closes_at_max_wait()
+    test_timed_out_request_is_never_run()
+    test_unregister_while_pending_closes_batch()
+    print("✅ Batch inference scheduler")
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""Test that the /ws/live push channel survives malformed client messages."""
+
+import json
+import tempfile
+from pathlib import Path
+
+from fastapi import FastAPI, WebSocket
+from fastapi.testclient import TestClient
+
+from backend.alert_bus import AlertBus
+from backend.camera_registry import CameraRegistry
+from backend.live_push import LiveSubscriber
+
+
+def make_app() -> FastAPI:
+    """App with only the push channel, over an empty camera registry."""
+    registry_path = Path(tempfile.mkdtemp()) / "cameras.json"
+    registry_path.write_text(json.dumps({"cameras": []}), encoding="utf-8")
+    registry = CameraRegistry(registry_path)
+
+    app = FastAPI()
+
+    @app.websocket("/ws/live")
+    async def live_socket(websocket: WebSocket):
+        await websocket.accept()
+        await LiveSubscriber(websocket, registry, AlertBus()).run()
+
+    return app
+
+
+def test_garbage_then_subscribe():
+    """Non-JSON text gets an error frame; the same socket still accepts a valid subscribe."""
+    client = TestClient(make_app())
+    with client.websocket_connect("/ws/live") as ws:
+        ws.send_text("this is not json")
+        reply = ws.receive_json()
+        assert reply["type"] == "error", reply
+
+        ws.send_json(["not", "an", "object"])
+        reply = ws.receive_json()
+        assert reply["type"] == "error", reply
+
+        ws.send_json({"action": "subscribe", "cameras": ["missing"], "channels": ["alerts"]})
+        reply = ws.receive_json()
+        assert reply["type"] == "subscribed", reply
+        assert reply["unknown"] == ["missing"], reply
+
+    print("✅ Push channel answers malformed messages and keeps the subscriber")
+
+
+if __name__ == "__main__":
+    test_garbage_then_subscribe()